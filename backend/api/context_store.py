@@ -4,11 +4,14 @@
 #  Title = company_role_YYYYMMDD-HHMMSS (for memory only).
 # ============================================================
 
-import json
+import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+import aiofiles
+import orjson
 from fastapi import APIRouter, HTTPException, Form
 from backend.core import config
 from backend.core.utils import safe_filename, log_event
@@ -24,26 +27,93 @@ def _nowstamp() -> str:
     return datetime.utcnow().strftime("%Y%m%d-%H%M%S")
 
 
-def _ctx_path(id_or_title: str) -> Path:
+@lru_cache(maxsize=1024)
+def _safe(name: str) -> str:
+    # Context titles are stable strings hit repeatedly per session —
+    # memoize the regex sanitization
+    return safe_filename(name)
+
+
+def _meta_path(id_or_title: str) -> Path:
     """
-    Map an arbitrary id/title to a safe JSON file path.
+    Map an arbitrary id/title to its metadata sidecar path.
     Accepts raw 'company_role_YYYYMMDD-HHMMSS' strings.
     """
-    return CONTEXT_DIR / f"{safe_filename(id_or_title)}.json"
+    return CONTEXT_DIR / f"{_safe(id_or_title)}.meta.json"
+
+
+def _blob_path(id_or_title: str) -> Path:
+    """Heavy payload (tex sources + base64 PDFs) for a context."""
+    return CONTEXT_DIR / f"{_safe(id_or_title)}.blob.json"
+
+
+# Heavy fields that live in the .blob.json sidecar; everything else is
+# metadata that /list needs.
+_BLOB_KEYS = ("jd_text", "resume_tex", "humanized_tex", "pdf_base64", "pdf_base64_humanized")
+
+
+def _migrate_legacy_files() -> None:
+    """
+    One-shot startup migration: split any monolithic '<id>.json' context
+    (pre-sidecar format) into '<id>.meta.json' + '<id>.blob.json'.
+    """
+    for p in CONTEXT_DIR.glob("*.json"):
+        if p.name.endswith((".meta.json", ".blob.json")):
+            continue
+        try:
+            d = orjson.loads(p.read_bytes())
+            blob = {k: d.pop(k, "") for k in _BLOB_KEYS}
+            stem = p.name[: -len(".json")]
+            (CONTEXT_DIR / f"{stem}.meta.json").write_bytes(orjson.dumps(d, option=orjson.OPT_INDENT_2))
+            (CONTEXT_DIR / f"{stem}.blob.json").write_bytes(orjson.dumps(blob))
+            p.unlink()
+        except Exception as e:
+            log_event("context_migrate_fail", {"file": p.name, "error": str(e)})
+
+
+_migrate_legacy_files()
+
+
+# Directory-listing cache: one stat on CONTEXT_DIR replaces N per-file
+# stats + a sort on every /list and /get?latest=true. `gen` is bumped on
+# save/delete so invalidation is immediate even on coarse FS mtime
+# resolution.
+_dir_cache: Dict[str, Any] = {"mtime": None, "gen": 0, "sorted": []}
+_dir_gen = 0
+
+
+def _invalidate_dir_cache() -> None:
+    global _dir_gen
+    _dir_gen += 1
+
+
+def _scan() -> list:
+    """Return [(Path, mtime), ...] for saved contexts, newest first."""
+    try:
+        dir_mtime = CONTEXT_DIR.stat().st_mtime
+    except OSError:
+        return []
+    if _dir_cache["mtime"] == dir_mtime and _dir_cache["gen"] == _dir_gen:
+        return _dir_cache["sorted"]
+    entries = []
+    with os.scandir(CONTEXT_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".meta.json") and entry.is_file():
+                entries.append((Path(entry.path), entry.stat().st_mtime))
+    entries.sort(key=lambda t: t[1], reverse=True)
+    _dir_cache.update(mtime=dir_mtime, gen=_dir_gen, sorted=entries)
+    return entries
 
 
 def _latest_path() -> Optional[Path]:
-    files = sorted(
-        CONTEXT_DIR.glob("*.json"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True
-    )
-    return files[0] if files else None
+    entries = _scan()
+    return entries[0][0] if entries else None
 
 
-def _read(path: Path) -> Dict[str, Any]:
+async def _read(path: Path) -> Dict[str, Any]:
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        async with aiofiles.open(path, "rb") as f:
+            return orjson.loads(await f.read())
     except Exception:
         return {}
 
@@ -82,24 +152,29 @@ async def save_context(
     title = f"{company}_{role}_{_nowstamp()}"
     ctx_id = title  # simple id; retrieval uses same string
 
-    payload = {
+    meta = {
         "id": ctx_id,
         "title": title,
         "company": company,
         "role": role,
+        "model": model or getattr(config, "DEFAULT_MODEL", "gpt-4o-mini"),
+        "fit_score": fit_score,
+        "saved_at": datetime.utcnow().isoformat(),
+        "app_version": getattr(config, "APP_VERSION", "2.x"),
+    }
+    blob = {
         "jd_text": jd_text,
         "resume_tex": resume_tex,
         "humanized_tex": humanized_tex or resume_tex,
         "pdf_base64": pdf_base64,
         "pdf_base64_humanized": pdf_base64_humanized,
-        "model": model or getattr(config, "DEFAULT_MODEL", "gpt-4o-mini"),
-        "fit_score": fit_score,
-        "saved_at": datetime.utcnow().isoformat(),
-        "app_version": getattr(config, "APP_VERSION", "2.x"),
     }
 
-    path = _ctx_path(ctx_id)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    async with aiofiles.open(_meta_path(ctx_id), "wb") as f:
+        await f.write(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+    async with aiofiles.open(_blob_path(ctx_id), "wb") as f:
+        await f.write(orjson.dumps(blob))
+    _invalidate_dir_cache()
     log_event("context_saved", {"title": title, "company": company, "role": role})
 
     return {"ok": True, "context_id": ctx_id, "title": title}
@@ -110,13 +185,9 @@ async def list_contexts(limit: int = 50):
     """
     Return recent contexts (newest first) with compact metadata.
     """
-    files = sorted(
-        CONTEXT_DIR.glob("*.json"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True
-    )[: max(1, min(limit, 500))]
+    files = [p for p, _ in _scan()[: max(1, min(limit, 500))]]
 
-    out = [_compact_meta(_read(p)) for p in files]
+    out = [_compact_meta(await _read(p)) for p in files]
     return {"items": out}
 
 
@@ -125,10 +196,13 @@ async def get_context(id_or_title: str = "", latest: bool = False):
     """
     Fetch a full saved context by id/title, or the latest one.
     """
-    path = _latest_path() if (latest or not id_or_title.strip()) else _ctx_path(id_or_title)
+    path = _latest_path() if (latest or not id_or_title.strip()) else _meta_path(id_or_title)
     if not path or not path.exists():
         raise HTTPException(status_code=404, detail="Context not found")
-    return _read(path)
+    ctx = await _read(path)
+    blob_path = path.with_name(path.name.replace(".meta.json", ".blob.json"))
+    ctx.update(await _read(blob_path))
+    return ctx
 
 
 @router.delete("/delete")
@@ -136,9 +210,11 @@ async def delete_context(id_or_title: str):
     """
     Delete a single context by id/title.
     """
-    path = _ctx_path(id_or_title)
+    path = _meta_path(id_or_title)
     if not path.exists():
         raise HTTPException(status_code=404, detail="Context not found")
     path.unlink()
+    _blob_path(id_or_title).unlink(missing_ok=True)
+    _invalidate_dir_cache()
     log_event("context_deleted", {"id": id_or_title})
     return {"deleted": True}
@@ -12,10 +12,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
+import os
 import re
-from typing import Tuple
+from typing import Optional, Tuple
 
 import httpx
 from fastapi import APIRouter, Form, HTTPException
@@ -35,6 +37,10 @@ openai_client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
 _EXTRACT_MODEL = getattr(config, "COVERLETTER_MODEL", getattr(config, "DEFAULT_MODEL", "gpt-4o-mini"))
 _DRAFT_MODEL = getattr(config, "COVERLETTER_MODEL", getattr(config, "DEFAULT_MODEL", "gpt-4o-mini"))
 
+# Compiled once — these run on every request
+_BODY_RE = re.compile(r"(%-+BODY-START-+%)(.*?)(%-+BODY-END-+%)", re.S)
+_COMPANY_ROLE_RE = re.compile(r'"company"\s*:\s*"([^"]+)"[^}]*"role"\s*:\s*"([^"]+)"')
+
 
 # ============================================================
 # 🧩 Common: robust text extractor for Responses API
@@ -84,7 +90,7 @@ async def extract_company_role(jd_text: str) -> Tuple[str, str]:
             return company, role
         except Exception:
             # Fallback: regex probe
-            m = re.search(r'"company"\s*:\s*"([^"]+)"[^}]*"role"\s*:\s*"([^"]+)"', raw)
+            m = _COMPANY_ROLE_RE.search(raw)
             if m:
                 return m.group(1).strip(), m.group(2).strip()
             return "Company", "Role"
@@ -122,13 +128,21 @@ async def draft_cover_body(jd_text: str, resume_text: str, company: str, role: s
     user_prompt = f"Job Description:\n{(jd_text or '')[:3500]}\n\nCandidate Resume:\n{(resume_text or '')[:3500]}"
 
     try:
-        resp = await openai_client.responses.create(
+        # Stream tokens as they arrive instead of blocking until the full
+        # 800-token response lands; latency tracks first-to-last token.
+        chunks: list[str] = []
+        async with openai_client.responses.stream(
             model=_DRAFT_MODEL,
             input=[{"role": "system", "content": sys_prompt}, {"role": "user", "content": user_prompt}],
             temperature=0.55,
             max_output_tokens=800,
-        )
-        body = _resp_text(resp)
+        ) as stream:
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    chunks.append(event.delta)
+            body = "".join(chunks).strip()
+            if not body:
+                body = _resp_text(await stream.get_final_response())
         # Sanitize for LaTeX early
         return secure_tex_input(body)
     except Exception as e:
@@ -139,12 +153,32 @@ async def draft_cover_body(jd_text: str, resume_text: str, company: str, role: s
 # ============================================================
 # 🧠 Humanize Text (via internal /api/superhuman)
 # ============================================================
+
+# Shared client: avoids a fresh TCP handshake + pool teardown per call.
+_HTTPX: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _HTTPX
+    if _HTTPX is None or _HTTPX.is_closed:
+        _HTTPX = httpx.AsyncClient(
+            timeout=40.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+        )
+    return _HTTPX
+
+
+@router.on_event("shutdown")
+async def _close_client():
+    if _HTTPX is not None and not _HTTPX.is_closed:
+        await _HTTPX.aclose()
+
+
 async def humanize_text(body_text: str, tone: str) -> str:
     url = f"{config.API_BASE_URL}/api/superhuman/rewrite"
     payload = {"text": body_text, "mode": "coverletter", "tone": tone, "latex_safe": True}
     try:
-        async with httpx.AsyncClient(timeout=40.0) as client:
-            r = await client.post(url, json=payload)
+        r = await _get_client().post(url, json=payload)
         r.raise_for_status()
         data = r.json()
         return data.get("rewritten") or data.get("text") or body_text
@@ -153,6 +187,22 @@ async def humanize_text(body_text: str, tone: str) -> str:
         return body_text  # fallback gracefully
 
 
+# ============================================================
+# 📄 Base Template Loader (mtime-cached)
+# ============================================================
+
+_TEMPLATE_CACHE = {"mtime": 0.0, "text": ""}
+
+
+def _read_template(path) -> str:
+    """Return the base template, rereading from disk only when it changed."""
+    st = os.stat(path)
+    if st.st_mtime != _TEMPLATE_CACHE["mtime"]:
+        with open(path, encoding="utf-8") as f:
+            _TEMPLATE_CACHE.update(mtime=st.st_mtime, text=f.read())
+    return _TEMPLATE_CACHE["text"]
+
+
 # ============================================================
 # 🧩 Inject Body into LaTeX Template
 # ============================================================
@@ -162,9 +212,8 @@ def inject_body_into_template(base_tex: str, body_tex: str) -> str:
     If anchors are missing, append a marked body section.
     """
     safe_body = secure_tex_input(body_tex)
-    pattern = r"(%-+BODY-START-+%)(.*?)(%-+BODY-END-+%)"
-    if re.search(pattern, base_tex, flags=re.S):
-        return re.sub(pattern, f"\\1\n{safe_body}\n\\3", base_tex, flags=re.S)
+    if _BODY_RE.search(base_tex):
+        return _BODY_RE.sub(f"\\1\n{safe_body}\n\\3", base_tex)
     # anchors missing — append
     return (
         base_tex
@@ -195,8 +244,16 @@ async def generate_coverletter(
     if not (jd_text or "").strip():
         raise HTTPException(status_code=400, detail="jd_text is required.")
 
-    # 1) Extract company + role
-    company, role = await extract_company_role(jd_text)
+    # 1) Extract company + role while the base template loads off-loop
+    #    (the two awaits are independent, so overlap them)
+    base_path = config.BASE_COVERLETTER_PATH
+    try:
+        (company, role), base_tex = await asyncio.gather(
+            extract_company_role(jd_text),
+            asyncio.to_thread(_read_template, base_path),
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Base cover-letter template not found")
 
     # 2) Draft initial body
     body_text = await draft_cover_body(jd_text, resume_tex, company, role, tone, length)
@@ -205,20 +262,12 @@ async def generate_coverletter(
     if use_humanize:
         body_text = await humanize_text(body_text, tone)
 
-    # 4) Load base template
-    base_path = config.BASE_COVERLETTER_PATH
-    try:
-        with open(base_path, encoding="utf-8") as f:
-            base_tex = f.read()
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Base cover-letter template not found")
-
-    # 5) Render + compile
+    # 4) Render + compile (pdflatex takes seconds — keep it off the loop)
     final_tex = render_final_tex(inject_body_into_template(base_tex, body_text))
-    pdf_bytes = compile_latex_safely(final_tex) or b""
-    pdf_b64 = base64.b64encode(pdf_bytes).decode("utf-8")
+    pdf_bytes = await asyncio.to_thread(compile_latex_safely, final_tex) or b""
+    pdf_b64 = (await asyncio.to_thread(base64.b64encode, pdf_bytes)).decode("utf-8")
 
-    # 6) Log generation event
+    # 5) Log generation event
     log_event(
         "coverletter_generated",
         {
@@ -231,7 +280,7 @@ async def generate_coverletter(
         },
     )
 
-    # 7) Respond with assets
+    # 6) Respond with assets
     return JSONResponse(
         {
             "company": company,
@@ -1,312 +1,540 @@
-# ============================================================
-#  HIREX v2.0.0 — Dashboard Analytics & History Endpoint
-#  ------------------------------------------------------------
-#  Provides:
-#   • Aggregated event summaries
-#   • Tone/mode analytics
-#   • Weekly trend data (Mon..Sun)
-#   • Recent history listing
-#   • Event type registry
-#   • Robust log reading & safe JSONL parsing
-#  Author: Sri Akash Kadali
-# ============================================================
-
-from __future__ import annotations
-
-import json
-from collections import Counter
-from datetime import datetime
-from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse
-
-from backend.core import config
-
-router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
-
-# ============================================================
-# 📁 Paths
-# ============================================================
-LOG_PATH = Path(getattr(config, "LOG_PATH", "backend/data/logs/events.jsonl"))
-HISTORY_PATH = Path(getattr(config, "HISTORY_PATH", "backend/data/history/history.jsonl"))
-
-for p in [LOG_PATH.parent, HISTORY_PATH.parent]:
-    p.mkdir(parents=True, exist_ok=True)
-
-
-# ============================================================
-# 🧩 Helpers: Safe JSONL Reader + Utilities
-# ============================================================
-
-def _read_jsonl(path: Path, limit: int = 500) -> List[Dict[str, Any]]:
-    """Safely read the last N lines of a JSONL file (newest first)."""
-    if not path.exists():
-        return []
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            lines = f.readlines()[-limit:]
-        records: List[Dict[str, Any]] = []
-        # Reverse so newest is first
-        for line in reversed(lines):
-            try:
-                obj = json.loads(line)
-                if isinstance(obj, dict):
-                    records.append(obj)
-            except json.JSONDecodeError:
-                continue
-        return records
-    except Exception:
-        return []
-
-
-def _iso(ts: Optional[str]) -> str:
-    """Coerce to ISO timestamp string (safe fallback to now)."""
-    if not ts:
-        return datetime.utcnow().isoformat()
-    try:
-        # Validate/normalize
-        _ = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        return ts
-    except Exception:
-        return datetime.utcnow().isoformat()
-
-
-def _event_name(e: Dict[str, Any]) -> str:
-    """Normalize event/type name."""
-    return (e.get("event") or e.get("type") or "unknown").lower()
-
-
-# ============================================================
-# 📊 Aggregations
-# ============================================================
-
-def summarize_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate analytic aggregates for dashboard visualizations."""
-    summary: Dict[str, Any] = {
-        "total_events": len(events),
-        "optimize_runs": 0,
-        "coverletters": 0,
-        "superhuman_calls": 0,
-        "talk_queries": 0,
-        "mastermind_chats": 0,
-        "tones": Counter(),
-        "modes": Counter(),
-        "avg_resume_length": 0.0,
-    }
-
-    total_len = 0
-    for e in events:
-        evt = _event_name(e)
-        meta = e.get("meta", {}) or {}
-
-        if "optimize" in evt:
-            summary["optimize_runs"] += 1
-        if "coverletter" in evt:
-            summary["coverletters"] += 1
-        if "superhuman" in evt or "humanize" in evt:
-            summary["superhuman_calls"] += 1
-        if "talk" in evt:
-            summary["talk_queries"] += 1
-        if "mastermind" in evt:
-            summary["mastermind_chats"] += 1
-
-        tone = str(meta.get("tone", "balanced")).lower()
-        mode = str(meta.get("mode", "general")).lower()
-        if tone:
-            summary["tones"][tone] += 1
-        if mode:
-            summary["modes"][mode] += 1
-
-        try:
-            total_len += int(meta.get("resume_len") or 0)
-        except Exception:
-            pass
-
-    total = max(summary["total_events"], 1)
-    summary["avg_resume_length"] = round(total_len / total, 2)
-
-    # Convert counters to plain dicts for JSON
-    summary["tones"] = dict(summary["tones"])
-    summary["modes"] = dict(summary["modes"])
-    return summary
-
-
-def summarize_history(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Extract recent high-level activity (for dashboard table)."""
-    out: List[Dict[str, Any]] = []
-    for h in records:
-        meta = h.get("meta", {}) or {}
-        ts = _iso(h.get("timestamp") or h.get("time"))
-        evt = _event_name(h)
-        out.append(
-            {
-                "timestamp": ts,
-                "event": evt,
-                "company": meta.get("company", ""),
-                "role": meta.get("role", ""),
-                "tone": meta.get("tone", "balanced"),
-                "score": meta.get("fit_score", None),
-                "length": meta.get("resume_len", None),
-                "source": h.get("origin", "system"),
-            }
-        )
-    return out
-
-
-def weekly_trend(records: List[Dict[str, Any]]) -> Dict[str, List[int]]:
-    """
-    Build Mon..Sun trend counts per category.
-    """
-    buckets = {
-        "optimizations": [0] * 7,
-        "coverletters": [0] * 7,
-        "superhuman": [0] * 7,
-        "mastermind": [0] * 7,
-        "talk": [0] * 7,
-    }
-
-    def _dow(ts: str) -> int:
-        try:
-            d = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-            # Monday=0
-            return d.weekday()
-        except Exception:
-            return 0
-
-    for r in records:
-        evt = _event_name(r)
-        ts = _iso(r.get("timestamp") or r.get("time"))
-        i = _dow(ts)
-        if "optimize" in evt:
-            buckets["optimizations"][i] += 1
-        elif "coverletter" in evt:
-            buckets["coverletters"][i] += 1
-        elif "superhuman" in evt or "humanize" in evt:
-            buckets["superhuman"][i] += 1
-        elif "mastermind" in evt:
-            buckets["mastermind"][i] += 1
-        elif "talk" in evt:
-            buckets["talk"][i] += 1
-
-    return buckets
-
-
-# ============================================================
-# 🚀 Root: Combined payload (summary + trend + history)
-# ============================================================
-@router.get("")
-async def dashboard_root(limit: int = Query(300, ge=1, le=2000)):
-    events = _read_jsonl(LOG_PATH, limit)
-    history = _read_jsonl(HISTORY_PATH, limit)
-    records = history or events
-
-    if not records:
-        return {"summary": {}, "trend": {}, "history": [], "updated": datetime.utcnow().isoformat()}
-
-    return {
-        "summary": summarize_events(records),
-        "trend": weekly_trend(records),
-        "history": summarize_history(records)[:100],
-        "updated": datetime.utcnow().isoformat(),
-    }
-
-
-# ============================================================
-# 🚀 Endpoint: /summary
-# ============================================================
-@router.get("/summary")
-async def get_summary(limit: int = Query(300, ge=1, le=2000)):
-    """
-    Aggregated dashboard summary used for top metrics and charts.
-    Combines analytics from events.jsonl and history.jsonl.
-    """
-    events = _read_jsonl(LOG_PATH, limit)
-    history = _read_jsonl(HISTORY_PATH, limit)
-
-    if not events and not history:
-        return JSONResponse({"message": "No analytics available.", "summary": {}, "recent": []})
-
-    # Prefer history when present
-    records = history or events
-    summary = summarize_events(records)
-    hist_data = summarize_history(records)
-
-    return {"summary": summary, "recent": hist_data[:100], "updated": datetime.utcnow().isoformat()}
-
-
-# ============================================================
-# 🚀 Endpoint: /trend
-# ============================================================
-@router.get("/trend")
-async def get_trend(limit: int = Query(300, ge=1, le=2000)):
-    """Weekly Mon..Sun trend counts by category."""
-    history = _read_jsonl(HISTORY_PATH, limit)
-    if not history:
-        history = _read_jsonl(LOG_PATH, limit)
-    return {"trend": weekly_trend(history), "updated": datetime.utcnow().isoformat()}
-
-
-# ============================================================
-# 🚀 Endpoint: /recent
-# ============================================================
-@router.get("/recent")
-async def get_recent(limit: int = Query(100, ge=1, le=1000)):
-    """Returns a chronological list of recent user-visible actions."""
-    history = _read_jsonl(HISTORY_PATH, limit)
-    if not history:
-        history = _read_jsonl(LOG_PATH, limit)
-    return {"events": summarize_history(history)}
-
-
-# ============================================================
-# 🚀 Endpoint: /types
-# ============================================================
-@router.get("/types")
-async def list_event_types():
-    """Returns a deduplicated list of event types for frontend filters."""
-    events = _read_jsonl(LOG_PATH, 1000)
-    types = sorted({(e.get("event") or e.get("type") or "").lower() for e in events if (e.get("event") or e.get("type"))})
-    return {"types": types}
-
-
-# ============================================================
-# 🧠 Endpoint: /metrics
-# ============================================================
-@router.get("/metrics")
-async def metrics_summary():
-    """Returns lightweight numeric insights (for quick dashboard cards)."""
-    events = _read_jsonl(LOG_PATH, 500)
-    if not events:
-        return {
-            "optimize": 0,
-            "coverletters": 0,
-            "superhuman": 0,
-            "talk": 0,
-            "mastermind": 0,
-            "updated": datetime.utcnow().isoformat(),
-        }
-
-    summary = summarize_events(events)
-    return {
-        "optimize": summary["optimize_runs"],
-        "coverletters": summary["coverletters"],
-        "superhuman": summary["superhuman_calls"],
-        "talk": summary["talk_queries"],
-        "mastermind": summary["mastermind_chats"],
-        "updated": datetime.utcnow().isoformat(),
-    }
-
-
-# ============================================================
-# 🧾 Endpoint: /raw
-# ============================================================
-@router.get("/raw")
-async def raw_dump(limit: int = Query(100, ge=1, le=2000)):
-    """
-    Developer-only diagnostic endpoint: returns raw JSON lines.
-    Use for backend debugging or analytics export.
-    """
-    events = _read_jsonl(LOG_PATH, limit)
-    return {"count": len(events), "events": events}
+# ============================================================
+#  HIREX v2.0.0 — Dashboard Analytics & History Endpoint
+#  ------------------------------------------------------------
+#  Provides:
+#   • Aggregated event summaries
+#   • Tone/mode analytics
+#   • Weekly trend data (Mon..Sun)
+#   • Recent history listing
+#   • Event type registry
+#   • Robust log reading & safe JSONL parsing
+#  Author: Sri Akash Kadali
+# ============================================================
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import orjson
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+
+from backend.core import config
+from backend.core.utils import tail_lines as _tail_lines
+
+router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
+
+# ============================================================
+# 📁 Paths
+# ============================================================
+LOG_PATH = Path(getattr(config, "LOG_PATH", "backend/data/logs/events.jsonl"))
+HISTORY_PATH = Path(getattr(config, "HISTORY_PATH", "backend/data/history/history.jsonl"))
+
+for p in [LOG_PATH.parent, HISTORY_PATH.parent]:
+    p.mkdir(parents=True, exist_ok=True)
+
+
+# ============================================================
+# 🧩 Helpers: Safe JSONL Reader + Utilities
+# ============================================================
+
+def _read_jsonl(path: Path, limit: int = 500) -> List[Dict[str, Any]]:
+    """Safely read the last N lines of a JSONL file (newest first)."""
+    if not path.exists():
+        return []
+    try:
+        lines = _tail_lines(path, limit)
+        records: List[Dict[str, Any]] = []
+        # Reverse so newest is first
+        for line in reversed(lines):
+            try:
+                obj = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(obj, dict):
+                records.append(obj)
+        return records
+    except Exception:
+        return []
+
+
+# ------------------------------------------------------------
+# Memoized aggregates: dashboards poll every few seconds, but the
+# underlying JSONL only changes on writes. Key on (path, mtime_ns,
+# size, limit) so any append/rotation invalidates naturally.
+# ------------------------------------------------------------
+_summary_cache: Dict[tuple, Any] = {}
+_SUMMARY_CACHE_MAX = 32
+
+
+def _cache_key(tag: str, limit: int, *paths: Path) -> tuple:
+    key: List[Any] = [tag, limit]
+    for p in paths:
+        try:
+            st = p.stat()
+            key += [str(p), st.st_mtime_ns, st.st_size]
+        except OSError:
+            key += [str(p), None, None]
+    return tuple(key)
+
+
+# Single-flight per key: concurrent pollers racing the same miss share
+# one compute instead of folding/parsing the same bytes twice.
+_memo_futures: Dict[tuple, "asyncio.Future[Any]"] = {}
+
+
+async def _memo(key: tuple, compute):
+    hit = _summary_cache.get(key)
+    if hit is not None:
+        return hit
+    fut = _memo_futures.get(key)
+    if fut is not None:
+        return await asyncio.shield(fut)
+    fut = asyncio.get_running_loop().create_future()
+    _memo_futures[key] = fut
+    try:
+        if len(_summary_cache) >= _SUMMARY_CACHE_MAX:
+            _summary_cache.clear()
+        # Cache misses do real file I/O + parsing — run them off the
+        # event loop so concurrent dashboard viewers don't serialize.
+        hit = await asyncio.to_thread(compute)
+        if hit is not None:
+            _summary_cache[key] = hit
+    except BaseException as e:
+        if not fut.done():
+            if isinstance(e, Exception):
+                fut.set_exception(e)
+            else:
+                fut.cancel()
+        raise
+    finally:
+        _memo_futures.pop(key, None)
+    fut.set_result(hit)
+    return hit
+
+
+def _iso(ts: Optional[str]) -> str:
+    """Coerce to ISO timestamp string (safe fallback to now)."""
+    if not ts:
+        return datetime.utcnow().isoformat()
+    try:
+        # Validate/normalize
+        _ = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        return ts
+    except Exception:
+        return datetime.utcnow().isoformat()
+
+
+@lru_cache(maxsize=64)
+def _norm_evt(raw: str) -> str:
+    # Event names form a small closed set — memoize the lowercase copy
+    return raw.lower()
+
+
+def _event_name(e: Dict[str, Any]) -> str:
+    """Normalize event/type name."""
+    return _norm_evt(e.get("event") or e.get("type") or "unknown")
+
+
+# ============================================================
+# 🔁 Incremental whole-log summary (append-only fold)
+# ============================================================
+# events.jsonl only ever grows, so instead of re-scanning the tail per
+# request we keep rolling counters plus the byte offset already folded;
+# each request parses only bytes appended since the last one. State is
+# persisted next to the log so restarts don't re-scan from zero.
+
+_INCR_PATH = LOG_PATH.with_name("events.summary.json")
+_INCR: Dict[str, Any] = {
+    "offset": 0,
+    "events": Counter(),
+    "tones": Counter(),
+    "modes": Counter(),
+    "total_len": 0,
+    "n": 0,
+}
+
+
+def _reset_incr() -> None:
+    _INCR.update(offset=0, events=Counter(), tones=Counter(), modes=Counter(), total_len=0, n=0)
+
+
+def _load_incr() -> None:
+    try:
+        d = json.loads(_INCR_PATH.read_text(encoding="utf-8"))
+        _INCR.update(
+            offset=int(d.get("offset", 0)),
+            events=Counter(d.get("events", {})),
+            tones=Counter(d.get("tones", {})),
+            modes=Counter(d.get("modes", {})),
+            total_len=int(d.get("total_len", 0)),
+            n=int(d.get("n", 0)),
+        )
+    except Exception:
+        _reset_incr()
+
+
+def _save_incr() -> None:
+    # Temp-and-replace: under gunicorn every worker saves at shutdown,
+    # and interleaved write_text calls could tear the JSON. Each
+    # worker's snapshot is self-consistent (its offset pairs with the
+    # counters it folded up to that offset, over the same shared log),
+    # so once writes are atomic, last-writer-wins is safe — whichever
+    # snapshot lands, the next load folds forward from its offset.
+    try:
+        tmp = _INCR_PATH.with_name(f"{_INCR_PATH.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "offset": _INCR["offset"],
+                    "events": dict(_INCR["events"]),
+                    "tones": dict(_INCR["tones"]),
+                    "modes": dict(_INCR["modes"]),
+                    "total_len": _INCR["total_len"],
+                    "n": _INCR["n"],
+                }
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, _INCR_PATH)
+    except Exception:
+        pass
+
+
+def _fold(e: Dict[str, Any]) -> None:
+    meta = e.get("meta", {}) or {}
+    _INCR["events"][_event_name(e)] += 1
+    _INCR["tones"][str(meta.get("tone", "balanced")).lower()] += 1
+    _INCR["modes"][str(meta.get("mode", "general")).lower()] += 1
+    try:
+        _INCR["total_len"] += int(meta.get("resume_len") or 0)
+    except Exception:
+        pass
+    _INCR["n"] += 1
+
+
+# The fold runs on thread-pool workers (via _memo's to_thread), so the
+# shared _INCR state needs a real lock — two concurrent folds from the
+# same offset would double-count every appended line.
+_incr_lock = threading.Lock()
+
+
+def _incremental_counts() -> Dict[str, int]:
+    """Fold any newly appended log bytes, then return category counts."""
+    with _incr_lock:
+        if not LOG_PATH.exists():
+            _reset_incr()
+        else:
+            size = LOG_PATH.stat().st_size
+            if size < _INCR["offset"]:
+                # Log shrank (rotation/truncation) — rebuild from scratch
+                _reset_incr()
+            if size > _INCR["offset"]:
+                with open(LOG_PATH, "rb") as f:
+                    f.seek(_INCR["offset"])
+                    for line in f:
+                        try:
+                            obj = orjson.loads(line)
+                        except orjson.JSONDecodeError:
+                            continue
+                        if isinstance(obj, dict):
+                            _fold(obj)
+                    _INCR["offset"] = f.tell()
+
+        counts = {"optimize": 0, "coverletters": 0, "superhuman": 0, "talk": 0, "mastermind": 0}
+        for evt, n in _INCR["events"].items():
+            if "optimize" in evt:
+                counts["optimize"] += n
+            if "coverletter" in evt:
+                counts["coverletters"] += n
+            if "superhuman" in evt or "humanize" in evt:
+                counts["superhuman"] += n
+            if "talk" in evt:
+                counts["talk"] += n
+            if "mastermind" in evt:
+                counts["mastermind"] += n
+        return counts
+
+
+_load_incr()
+
+
+@router.on_event("shutdown")
+async def _persist_incr():
+    _save_incr()
+
+
+# ============================================================
+# 📊 Aggregations
+# ============================================================
+
+def summarize_history(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Extract recent high-level activity (for dashboard table)."""
+    out: List[Dict[str, Any]] = []
+    for h in records:
+        meta = h.get("meta", {}) or {}
+        ts = _iso(h.get("timestamp") or h.get("time"))
+        evt = _event_name(h)
+        out.append(
+            {
+                "timestamp": ts,
+                "event": evt,
+                "company": meta.get("company", ""),
+                "role": meta.get("role", ""),
+                "tone": meta.get("tone", "balanced"),
+                "score": meta.get("fit_score", None),
+                "length": meta.get("resume_len", None),
+                "source": h.get("origin", "system"),
+            }
+        )
+    return out
+
+
+@lru_cache(maxsize=64)
+def _trend_bucket(evt: str) -> Optional[str]:
+    """Map an event name to its trend category (first match wins)."""
+    if "optimize" in evt:
+        return "optimizations"
+    if "coverletter" in evt:
+        return "coverletters"
+    if "superhuman" in evt or "humanize" in evt:
+        return "superhuman"
+    if "mastermind" in evt:
+        return "mastermind"
+    if "talk" in evt:
+        return "talk"
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _dow(ts: str) -> int:
+    # Timestamps repeat across aggregation passes; cache the parsed weekday
+    try:
+        d = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        # Monday=0
+        return d.weekday()
+    except Exception:
+        return 0
+
+
+def weekly_trend(records: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """
+    Build Mon..Sun trend counts per category.
+
+    Extracts (bucket, weekday) pairs columnar-style in one pass, then
+    counts them with a single C-level Counter instead of per-record
+    branch + list-index increments.
+    """
+    buckets = {
+        "optimizations": [0] * 7,
+        "coverletters": [0] * 7,
+        "superhuman": [0] * 7,
+        "mastermind": [0] * 7,
+        "talk": [0] * 7,
+    }
+
+    pairs = Counter(
+        (bucket, _dow(_iso(r.get("timestamp") or r.get("time"))))
+        for r in records
+        if (bucket := _trend_bucket(_event_name(r))) is not None
+    )
+    for (bucket, i), n in pairs.items():
+        buckets[bucket][i] = n
+
+    return buckets
+
+
+def _fused_aggregate(records: List[Dict[str, Any]], hist_cap: int = 100):
+    """
+    Build summary, weekly trend, and history rows in one pass.
+
+    dashboard_root and /summary need all three views of the same record
+    list; fusing the loops traverses the records once instead of three
+    times.
+    """
+    summary: Dict[str, Any] = {
+        "total_events": len(records),
+        "optimize_runs": 0,
+        "coverletters": 0,
+        "superhuman_calls": 0,
+        "talk_queries": 0,
+        "mastermind_chats": 0,
+        "tones": Counter(),
+        "modes": Counter(),
+        "avg_resume_length": 0.0,
+    }
+    buckets = {
+        "optimizations": [0] * 7,
+        "coverletters": [0] * 7,
+        "superhuman": [0] * 7,
+        "mastermind": [0] * 7,
+        "talk": [0] * 7,
+    }
+    hist: List[Dict[str, Any]] = []
+
+    total_len = 0
+    for h in records:
+        evt = _event_name(h)
+        meta = h.get("meta", {}) or {}
+        ts = _iso(h.get("timestamp") or h.get("time"))
+
+        if "optimize" in evt:
+            summary["optimize_runs"] += 1
+        if "coverletter" in evt:
+            summary["coverletters"] += 1
+        if "superhuman" in evt or "humanize" in evt:
+            summary["superhuman_calls"] += 1
+        if "talk" in evt:
+            summary["talk_queries"] += 1
+        if "mastermind" in evt:
+            summary["mastermind_chats"] += 1
+
+        tone = str(meta.get("tone", "balanced")).lower()
+        mode = str(meta.get("mode", "general")).lower()
+        if tone:
+            summary["tones"][tone] += 1
+        if mode:
+            summary["modes"][mode] += 1
+        try:
+            total_len += int(meta.get("resume_len") or 0)
+        except Exception:
+            pass
+
+        bucket = _trend_bucket(evt)
+        if bucket:
+            buckets[bucket][_dow(ts)] += 1
+
+        if len(hist) < hist_cap:
+            hist.append(
+                {
+                    "timestamp": ts,
+                    "event": evt,
+                    "company": meta.get("company", ""),
+                    "role": meta.get("role", ""),
+                    "tone": meta.get("tone", "balanced"),
+                    "score": meta.get("fit_score", None),
+                    "length": meta.get("resume_len", None),
+                    "source": h.get("origin", "system"),
+                }
+            )
+
+    summary["avg_resume_length"] = round(total_len / max(len(records), 1), 2)
+    summary["tones"] = dict(summary["tones"])
+    summary["modes"] = dict(summary["modes"])
+    return summary, buckets, hist
+
+
+# ============================================================
+# 🚀 Root: Combined payload (summary + trend + history)
+# ============================================================
+@router.get("")
+async def dashboard_root(limit: int = Query(300, ge=1, le=2000)):
+    def _compute():
+        events = _read_jsonl(LOG_PATH, limit)
+        history = _read_jsonl(HISTORY_PATH, limit)
+        records = history or events
+        if not records:
+            return {"summary": {}, "trend": {}, "history": []}
+        summary, trend, hist = _fused_aggregate(records)
+        return {"summary": summary, "trend": trend, "history": hist}
+
+    body = await _memo(_cache_key("root", limit, LOG_PATH, HISTORY_PATH), _compute)
+    return {**body, "updated": datetime.utcnow().isoformat()}
+
+
+# ============================================================
+# 🚀 Endpoint: /summary
+# ============================================================
+@router.get("/summary")
+async def get_summary(limit: int = Query(300, ge=1, le=2000)):
+    """
+    Aggregated dashboard summary used for top metrics and charts.
+    Combines analytics from events.jsonl and history.jsonl.
+    """
+    def _compute():
+        events = _read_jsonl(LOG_PATH, limit)
+        history = _read_jsonl(HISTORY_PATH, limit)
+        if not events and not history:
+            return None
+        # Prefer history when present
+        records = history or events
+        summary, _, hist = _fused_aggregate(records)
+        return {"summary": summary, "recent": hist}
+
+    body = await _memo(_cache_key("summary", limit, LOG_PATH, HISTORY_PATH), _compute)
+    if body is None:
+        return JSONResponse({"message": "No analytics available.", "summary": {}, "recent": []})
+    return {**body, "updated": datetime.utcnow().isoformat()}
+
+
+# ============================================================
+# 🚀 Endpoint: /trend
+# ============================================================
+@router.get("/trend")
+async def get_trend(limit: int = Query(300, ge=1, le=2000)):
+    """Weekly Mon..Sun trend counts by category."""
+    def _compute():
+        history = _read_jsonl(HISTORY_PATH, limit)
+        if not history:
+            history = _read_jsonl(LOG_PATH, limit)
+        return weekly_trend(history)
+
+    trend = await _memo(_cache_key("trend", limit, LOG_PATH, HISTORY_PATH), _compute)
+    return {"trend": trend, "updated": datetime.utcnow().isoformat()}
+
+
+# ============================================================
+# 🚀 Endpoint: /recent
+# ============================================================
+@router.get("/recent")
+async def get_recent(limit: int = Query(100, ge=1, le=1000)):
+    """Returns a chronological list of recent user-visible actions."""
+    def _compute():
+        history = _read_jsonl(HISTORY_PATH, limit)
+        if not history:
+            history = _read_jsonl(LOG_PATH, limit)
+        return summarize_history(history)
+
+    return {"events": await _memo(_cache_key("recent", limit, LOG_PATH, HISTORY_PATH), _compute)}
+
+
+# ============================================================
+# 🚀 Endpoint: /types
+# ============================================================
+@router.get("/types")
+async def list_event_types():
+    """Returns a deduplicated list of event types for frontend filters."""
+    events = await asyncio.to_thread(_read_jsonl, LOG_PATH, 1000)
+    types = sorted({(e.get("event") or e.get("type") or "").lower() for e in events if (e.get("event") or e.get("type"))})
+    return {"types": types}
+
+
+# ============================================================
+# 🧠 Endpoint: /metrics
+# ============================================================
+@router.get("/metrics")
+async def metrics_summary():
+    """Returns lightweight numeric insights (for quick dashboard cards)."""
+    body = await _memo(_cache_key("metrics", 0, LOG_PATH), _incremental_counts)
+    return {**body, "updated": datetime.utcnow().isoformat()}
+
+
+# ============================================================
+# 🧾 Endpoint: /raw
+# ============================================================
+@router.get("/raw")
+async def raw_dump(limit: int = Query(100, ge=1, le=2000)):
+    """
+    Developer-only diagnostic endpoint: returns raw JSON lines.
+    Use for backend debugging or analytics export.
+    """
+    events = await asyncio.to_thread(_read_jsonl, LOG_PATH, limit)
+    return {"count": len(events), "events": events}
@@ -16,10 +16,11 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from typing import Any, Dict
 
+import orjson
+
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
@@ -35,12 +36,17 @@ def _now_iso() -> str:
 def _truncate(obj: Any, limit: int = 800) -> str:
     """
     Truncate a JSON-serialized preview to avoid spammy console logs.
+    Compact-serializes first; only small payloads get the pretty-print,
+    so a megabyte blob is never fully indented just to keep 800 chars.
     """
     try:
-        s = json.dumps(obj, ensure_ascii=False, indent=2)
+        raw = orjson.dumps(obj, default=str)
+        if len(raw) <= limit:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
+        return raw[:limit].decode("utf-8", "ignore") + "…"
     except Exception:
         s = str(obj)
-    return (s[:limit] + "…") if len(s) > limit else s
+        return (s[:limit] + "…") if len(s) > limit else s
 
 
 @router.get("/ping")
@@ -100,7 +106,8 @@ async def debug_log(request: Request):
     msg = payload.get("msg", "(no message)")
     page = payload.get("page", "?")
     print(f"[FE DEBUG] ({page}) {msg}")
-    preview = {k: payload[k] for k in payload if k not in {"raw"}}
+    preview = payload.copy()
+    preview.pop("raw", None)
     print("  └─", _truncate(preview))
 
     # ---------- 4️⃣ Persist via log_event ----------
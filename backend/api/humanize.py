@@ -1,310 +1,632 @@
-"""
-HIREX • api/humanize.py (v2.0.0)
-Integrates with AIHumanize.io for tone-only rewriting of Experience & Project bullets.
-Targets only \resumeItem{...} entries, with strong LaTeX sanitization to avoid
-preamble duplication or document corruption. Concurrency + retry hardened.
-
-Author: Sri Akash Kadali
-"""
-
-from __future__ import annotations
-
-import os
-import re
-import json
-import asyncio
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
-
-import httpx
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-
-from backend.core import config
-from backend.core.utils import log_event
-
-# ============================================================
-# ⚙️ Configuration
-# ============================================================
-
-AIHUMANIZE_API_URL = "https://aihumanize.io/api/v1/rewrite"
-
-# UI modes → API numeric model ids
-AIHUMANIZE_MODE_MAP = {
-    "quality": "0",   # default
-    "balance": "1",
-    "enhanced": "2",
-}
-
-# Defaults (can be overridden per-request or via env)
-AIHUMANIZE_DEFAULT_MODE = os.getenv("AIHUMANIZE_MODE", "quality").lower().strip()
-AIHUMANIZE_DEFAULT_EMAIL = os.getenv("AIHUMANIZE_EMAIL", "kadali18@terpmail.umd.edu")
-
-MAX_CONCURRENT = int(os.getenv("AIHUMANIZE_MAX_CONCURRENT", "5"))
-TIMEOUT_SEC = float(os.getenv("AIHUMANIZE_TIMEOUT_SEC", "15.0"))
-RETRIES = int(os.getenv("AIHUMANIZE_RETRIES", "2"))
-
-# FastAPI router (optional for direct API usage)
-router = APIRouter(prefix="/api/humanize", tags=["humanize"])
-
-
-# ============================================================
-# 🧽 LaTeX Sanitizer
-# ============================================================
-
-_BAD_PREAMBLE_PATTERNS = [
-    r"(?i)\\documentclass(\[[^\]]*\])?\{[^}]*\}",
-    r"(?i)\\usepackage(\[[^\]]*\])?\{[^}]*\}",
-    r"(?i)\\begin\{document\}",
-    r"(?i)\\end\{document\}",
-    r"(?i)\\(new|renew)command\*?\{[^}]*\}\{[^}]*\}",
-    r"(?i)\\input\{[^}]*\}",
-]
-
-def _escape_unescaped_percent(s: str) -> str:
-    # Turn bare % into \% to avoid commenting out the remainder of the line
-    return re.sub(r"(?<!\\)%", r"\\%", s)
-
-def _strip_md_fences(s: str) -> str:
-    s = s.replace("```latex", "").replace("```", "")
-    return s
-
-def clean_humanized_text(text: str) -> str:
-    """
-    Remove dangerous LaTeX preamble/commands and markdown fences.
-    Keep content characters intact; do NOT strip braces globally.
-    """
-    cleaned = text or ""
-    cleaned = _strip_md_fences(cleaned)
-
-    for pat in _BAD_PREAMBLE_PATTERNS:
-        cleaned = re.sub(pat, "", cleaned)
-
-    # Remove leading LaTeX comments or decorative headers commonly injected
-    cleaned = re.sub(r"(?m)^\s*%.*$", "", cleaned)
-
-    # Normalize whitespace
-    cleaned = re.sub(r"[ \t]+", " ", cleaned)
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned).strip()
-
-    # Escape stray %
-    cleaned = _escape_unescaped_percent(cleaned)
-
-    # Final safety check
-    if re.search(r"\\documentclass|\\usepackage|\\begin\{document\}|\\end\{document\}", cleaned, re.I):
-        # If we still see preamble markers, reject to avoid corrupting the .tex
-        log_event("humanize_sanitizer_reject", {"reason": "preamble_detected"})
-        return ""
-
-    return cleaned
-
-
-# ============================================================
-# 🔎 Bullet Extraction (brace-aware)
-# ============================================================
-
-@dataclass
-class BulletSpan:
-    start: int
-    end: int
-    content: str
-
-def _find_resume_items(tex: str) -> List[BulletSpan]:
-    """
-    Find \resumeItem{...} ranges with a simple brace-depth scan,
-    so nested braces within the bullet are tolerated.
-    """
-    key = r"\resumeItem{"
-    spans: List[BulletSpan] = []
-    i = 0
-    n = len(tex)
-    while i < n:
-        j = tex.find(key, i)
-        if j == -1:
-            break
-        # position of opening brace content
-        k = j + len(key)
-        depth = 1
-        p = k
-        while p < n and depth > 0:
-            ch = tex[p]
-            if ch == "{":
-                depth += 1
-            elif ch == "}":
-                depth -= 1
-            p += 1
-        if depth == 0:
-            content = tex[k : p - 1]
-            spans.append(BulletSpan(start=k, end=p - 1, content=content))
-            i = p
-        else:
-            # Unbalanced; bail from loop
-            break
-    return spans
-
-
-# ============================================================
-# 🌐 AIHumanize Client
-# ============================================================
-
-async def _rewrite_bullet(
-    client: httpx.AsyncClient,
-    bullet_text: str,
-    idx: int,
-    mode_id: str,
-    email: str,
-) -> str:
-    """
-    Call AIHumanize for a single bullet with retry + sanitize.
-    """
-    headers = {
-        "Authorization": config.HUMANIZE_API_KEY,
-        "Content-Type": "application/json",
-    }
-    payload = {"model": mode_id, "mail": email, "data": bullet_text}
-
-    for attempt in range(RETRIES + 1):
-        try:
-            r = await client.post(AIHUMANIZE_API_URL, headers=headers, json=payload)
-            r.raise_for_status()
-            data = r.json()
-            if isinstance(data, dict) and data.get("code") == 200 and data.get("data"):
-                candidate = clean_humanized_text(str(data["data"]).strip())
-                if candidate:
-                    log_event("aihumanize_bullet_ok", {"idx": idx, "len": len(candidate), "attempt": attempt})
-                    return candidate
-                else:
-                    log_event("aihumanize_bullet_revert_unsafe", {"idx": idx, "attempt": attempt})
-                    return bullet_text
-            else:
-                # Unexpected response shape — retry
-                log_event("aihumanize_bad_response", {"idx": idx, "attempt": attempt, "resp": data})
-        except Exception as e:
-            log_event("aihumanize_bullet_error", {"idx": idx, "attempt": attempt, "error": str(e)})
-        # backoff
-        await asyncio.sleep(0.5 * (2 ** attempt))
-
-    log_event("aihumanize_bullet_fallback", {"idx": idx})
-    return bullet_text
-
-
-# ============================================================
-# 🧠 Public Core: Humanize all \resumeItem bullets
-# ============================================================
-
-async def humanize_resume_items(
-    tex_content: str,
-    mode: str = AIHUMANIZE_DEFAULT_MODE,
-    email: Optional[str] = None,
-) -> Tuple[str, int, int]:
-    """
-    Humanize all \resumeItem{...} bullets concurrently.
-
-    Returns:
-        (new_tex, total_found, total_rewritten)
-    """
-    if not config.HUMANIZE_API_KEY:
-        raise RuntimeError("HUMANIZE_API_KEY missing in environment.")
-
-    spans = _find_resume_items(tex_content or "")
-    total_found = len(spans)
-    if total_found == 0:
-        log_event("aihumanize_no_bullets", {})
-        return tex_content, 0, 0
-
-    mode_id = AIHUMANIZE_MODE_MAP.get(mode.lower().strip(), AIHUMANIZE_MODE_MAP["quality"])
-    mail = (email or AIHUMANIZE_DEFAULT_EMAIL).strip()
-
-    limits = httpx.Limits(max_keepalive_connections=MAX_CONCURRENT, max_connections=MAX_CONCURRENT)
-    timeout = httpx.Timeout(TIMEOUT_SEC)
-    rewritten_texts: List[str] = []
-
-    sem = asyncio.Semaphore(MAX_CONCURRENT)
-
-    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
-        async def _task(idx: int, content: str) -> str:
-            async with sem:
-                content_stripped = content.strip()
-                if not content_stripped:
-                    return content
-                return await _rewrite_bullet(client, content_stripped, idx, mode_id, mail)
-
-        rewritten_texts = await asyncio.gather(
-            *[_task(i + 1, b.content) for i, b in enumerate(spans)], return_exceptions=False
-        )
-
-    # Rebuild the LaTeX safely by slicing with recorded spans
-    out_parts: List[str] = []
-    last = 0
-    total_rewritten = 0
-    for (span, new_txt) in zip(spans, rewritten_texts):
-        out_parts.append(tex_content[last:span.start])
-        # ensure single trailing period is not duplicated; bullets usually avoid ending '.'
-        safe_new = new_txt.strip().rstrip(".")
-        if safe_new != span.content.strip():
-            total_rewritten += 1
-        out_parts.append(safe_new)
-        last = span.end
-    out_parts.append(tex_content[last:])
-
-    new_tex = "".join(out_parts)
-
-    # Final safety: strip accidental preamble fragments
-    for pat in _BAD_PREAMBLE_PATTERNS:
-        new_tex = re.sub(pat, "", new_tex)
-    new_tex = re.sub(r"\n{3,}", "\n\n", new_tex).strip()
-
-    log_event("aihumanize_complete", {"found": total_found, "rewritten": total_rewritten, "mode": mode})
-    return new_tex, total_found, total_rewritten
-
-
-# ============================================================
-# 🌐 FastAPI endpoints (optional, convenient for frontend)
-# ============================================================
-
-class BulletsReq(BaseModel):
-    tex_content: str = Field(..., description="LaTeX content containing \\resumeItem{...} bullets.")
-    mode: str = Field(AIHUMANIZE_DEFAULT_MODE, description="quality | balance | enhanced")
-    email: Optional[str] = Field(None, description="Account email for AIHumanize (optional override).")
-
-@router.post("/bullets")
-async def api_humanize_bullets(req: BulletsReq):
-    """
-    Rewrites only \\resumeItem{...} bullets inside the provided LaTeX string.
-    Returns sanitized LaTeX. Requires HUMANIZE_API_KEY in env.
-    """
-    if not config.HUMANIZE_API_KEY:
-        raise HTTPException(status_code=400, detail="HUMANIZE_API_KEY missing in environment.")
-    try:
-        new_tex, found, rewritten = await humanize_resume_items(req.tex_content, mode=req.mode, email=req.email)
-        return {
-            "ok": True,
-            "tex_content": new_tex,
-            "found": found,
-            "rewritten": rewritten,
-            "mode": req.mode,
-        }
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"AIHumanize processing failed: {e}")
-
-
-# ============================================================
-# 🧪 Local CLI test
-# ============================================================
-
-if __name__ == "__main__":
-    async def _run():
-        sample_tex = r"""
-        \resumeItem{worked on python scripts for data processing}
-        \resumeItem{helped team with docker deployments}
-        \resumeItem{deployed 3 APIs with 99\% uptime}
-        """
-        # Note: requires HUMANIZE_API_KEY in your env to actually call service.
-        try:
-            out, found, rewritten = await humanize_resume_items(sample_tex, mode="quality")
-            print("\n=== Found:", found, "Rewritten:", rewritten, "===\n")
-            print(out)
-        except Exception as e:
-            print("Local test (no key?) error:", e)
-
-    asyncio.run(_run())
+"""
+HIREX • api/humanize.py (v2.0.0)
+Integrates with AIHumanize.io for tone-only rewriting of Experience & Project bullets.
+Targets only \resumeItem{...} entries, with strong LaTeX sanitization to avoid
+preamble duplication or document corruption. Concurrency + retry hardened.
+
+Author: Sri Akash Kadali
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+import json
+import random
+import asyncio
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Tuple, Optional
+
+import httpx
+import orjson
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+
+from backend.core import config
+from backend.core.utils import log_event
+
+# ============================================================
+# ⚙️ Configuration
+# ============================================================
+
+AIHUMANIZE_API_URL = "https://aihumanize.io/api/v1/rewrite"
+
+# UI modes → API numeric model ids
+AIHUMANIZE_MODE_MAP = {
+    "quality": "0",   # default
+    "balance": "1",
+    "enhanced": "2",
+}
+
+# Defaults (can be overridden per-request or via env)
+AIHUMANIZE_DEFAULT_MODE = os.getenv("AIHUMANIZE_MODE", "quality").lower().strip()
+AIHUMANIZE_DEFAULT_EMAIL = os.getenv("AIHUMANIZE_EMAIL", "kadali18@terpmail.umd.edu")
+
+# Single authoritative concurrency limit: the httpx pool caps and the
+# admission controller ceiling are both derived from this value, so the
+# two can never drift (pool queueing vs idle slots).
+MAX_CONCURRENT = int(os.getenv("AIHUMANIZE_MAX_CONCURRENT", "5"))
+TIMEOUT_SEC = float(os.getenv("AIHUMANIZE_TIMEOUT_SEC", "15.0"))
+RETRIES = int(os.getenv("AIHUMANIZE_RETRIES", "2"))
+
+# FastAPI router (optional for direct API usage)
+router = APIRouter(prefix="/api/humanize", tags=["humanize"], default_response_class=ORJSONResponse)
+
+
+# ============================================================
+# 🧽 LaTeX Sanitizer
+# ============================================================
+
+_BAD_PREAMBLE_PATTERNS = [
+    r"\\documentclass(\[[^\]]*\])?\{[^}]*\}",
+    r"\\usepackage(\[[^\]]*\])?\{[^}]*\}",
+    r"\\begin\{document\}",
+    r"\\end\{document\}",
+    r"\\(new|renew)command\*?\{[^}]*\}\{[^}]*\}",
+    r"\\input\{[^}]*\}",
+]
+
+# Compiled once — sanitization runs per bullet and per final document.
+# The preamble patterns collapse into a single alternation so removal is
+# one pass over the string instead of six.
+_PREAMBLE_RE = re.compile("|".join(f"(?:{p})" for p in _BAD_PREAMBLE_PATTERNS), re.IGNORECASE)
+_COMMENT_RE = re.compile(r"(?m)^\s*%.*$")
+_WS_RE = re.compile(r"[ \t]+")
+_BLANK_RE = re.compile(r"\n{3,}")
+_PCT_RE = re.compile(r"(?<!\\)%")
+_DETECT_RE = re.compile(r"\\documentclass|\\usepackage|\\begin\{document\}|\\end\{document\}", re.I)
+
+# Bytes-level preamble probe: runs on the raw response body before any
+# UTF-8 decode or sanitize pass, so a large hallucinated preamble is
+# rejected without paying decode + multi-regex cost first.
+_BAD_BYTES_RE = re.compile(rb"\\(?:documentclass|usepackage|begin\{document\}|end\{document\})", re.I)
+
+def _escape_unescaped_percent(s: str) -> str:
+    # Turn bare % into \% to avoid commenting out the remainder of the line
+    return _PCT_RE.sub(r"\\%", s)
+
+def _strip_md_fences(s: str) -> str:
+    s = s.replace("```latex", "").replace("```", "")
+    return s
+
+def _sanitize_fast(s: str) -> str:
+    """
+    Single fused pass over the text: collapses space/tab runs, caps
+    blank-line runs at one, and escapes bare '%'. Replaces three
+    separate regex traversals with one.
+    """
+    out: List[str] = []
+    i = 0
+    n = len(s)
+    while i < n:
+        ch = s[i]
+        if ch == " " or ch == "\t":
+            j = i + 1
+            while j < n and (s[j] == " " or s[j] == "\t"):
+                j += 1
+            out.append(" ")
+            i = j
+            continue
+        if ch == "\n":
+            j = i + 1
+            while j < n and s[j] == "\n":
+                j += 1
+            out.append("\n" if j - i == 1 else "\n\n")
+            i = j
+            continue
+        if ch == "%" and (not out or not out[-1].endswith("\\")):
+            out.append("\\%")
+            i += 1
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out).strip()
+
+def clean_humanized_text(text: str) -> str:
+    """
+    Remove dangerous LaTeX preamble/commands and markdown fences.
+    Keep content characters intact; do NOT strip braces globally.
+    """
+    cleaned = text or ""
+    cleaned = _strip_md_fences(cleaned)
+
+    cleaned = _PREAMBLE_RE.sub("", cleaned)
+
+    # Remove leading LaTeX comments or decorative headers commonly injected
+    cleaned = _COMMENT_RE.sub("", cleaned)
+
+    # Fused whitespace normalize + '%' escape
+    cleaned = _sanitize_fast(cleaned)
+
+    # Final safety check ('\\' memchr probe short-circuits the regex
+    # scan for the common all-prose bullet)
+    if "\\" in cleaned and _DETECT_RE.search(cleaned):
+        # If we still see preamble markers, reject to avoid corrupting the .tex
+        log_event("humanize_sanitizer_reject", {"reason": "preamble_detected"})
+        return ""
+
+    return cleaned
+
+
+# ============================================================
+# 🔎 Bullet Extraction (brace-aware)
+# ============================================================
+
+@dataclass
+class BulletSpan:
+    start: int
+    end: int
+    content: str
+    # Stripped once at extraction; the dedup map and rebuild loop both
+    # need it, so neither re-strips the immutable content.
+    content_stripped: str = ""
+
+# Tolerates whitespace between the macro and its opening brace, so the
+# header scan survives \resumeItem {...} formatting variants.
+_RESUME_ITEM_RE = re.compile(r"\\resumeItem\s*\{")
+
+
+def _find_resume_items(tex: str) -> List[BulletSpan]:
+    """
+    Find \resumeItem{...} ranges in two phases: one C-level regex scan
+    for the macro headers, then a brace-depth walk per bullet that jumps
+    between braces with str.find — the interpreter loop runs per brace,
+    not per character. Nested braces within a bullet are tolerated.
+    """
+    spans: List[BulletSpan] = []
+    last_end = 0
+    for m in _RESUME_ITEM_RE.finditer(tex):
+        if m.start() < last_end:
+            # Header nested inside a previous bullet's braces
+            continue
+        # position of opening brace content
+        k = m.end()
+        depth = 1
+        p = k
+        while depth > 0:
+            nxt_open = tex.find("{", p)
+            nxt_close = tex.find("}", p)
+            if nxt_close == -1:
+                # Unbalanced; bail from loop
+                return spans
+            if nxt_open != -1 and nxt_open < nxt_close:
+                depth += 1
+                p = nxt_open + 1
+            else:
+                depth -= 1
+                p = nxt_close + 1
+        content = tex[k : p - 1]
+        spans.append(BulletSpan(start=k, end=p - 1, content=content, content_stripped=content.strip()))
+        last_end = p
+    return spans
+
+
+# ============================================================
+# 🌐 AIHumanize Client
+# ============================================================
+
+# Long-lived client: connection (and TLS session) reuse across batches
+# instead of a fresh handshake per humanize request.
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=MAX_CONCURRENT,
+                max_connections=MAX_CONCURRENT,
+                keepalive_expiry=60,
+            ),
+            timeout=httpx.Timeout(TIMEOUT_SEC),
+        )
+    return _HTTP_CLIENT
+
+
+@router.on_event("shutdown")
+async def _close_http_client():
+    if _HTTP_CLIENT is not None and not _HTTP_CLIENT.is_closed:
+        await _HTTP_CLIENT.aclose()
+
+
+# Admission controller: a Condition-guarded counter instead of a fixed
+# Semaphore, so the concurrency ceiling can be retuned at runtime
+# (e.g. after sustained 429s) without restarting the process.
+_admission_cond = asyncio.Condition()
+_active = 0
+_max_concurrent = MAX_CONCURRENT
+
+
+async def _acquire_slot() -> None:
+    global _active
+    async with _admission_cond:
+        while _active >= _max_concurrent:
+            await _admission_cond.wait()
+        _active += 1
+
+
+async def _release_slot() -> None:
+    global _active
+    async with _admission_cond:
+        _active -= 1
+        _admission_cond.notify(1)
+
+
+async def set_max_concurrency(n: int) -> None:
+    """
+    Retune the AIHumanize concurrency ceiling at runtime. Clamped to the
+    httpx pool capacity — anything above it would only queue inside the
+    transport.
+    """
+    global _max_concurrent
+    async with _admission_cond:
+        _max_concurrent = min(MAX_CONCURRENT, max(1, int(n)))
+        _admission_cond.notify_all()
+
+
+# Cheap "already humanized" heuristic: a bullet that opens with a strong
+# action verb, carries real length and no filler words reads as polished
+# already — skip the billed round-trip. O(len) string ops vs a network RTT.
+_STRONG_VERBS = frozenset({
+    "accelerated", "architected", "automated", "built", "created", "delivered",
+    "designed", "developed", "drove", "engineered", "implemented", "improved",
+    "launched", "led", "optimized", "reduced", "scaled", "shipped", "spearheaded",
+})
+_FILLER_WORDS = frozenset({
+    "basically", "helped", "just", "really", "some", "stuff", "things",
+    "various", "very", "worked",
+})
+
+
+def _looks_polished(text: str) -> bool:
+    toks = text.lower().split()
+    if not toks or len(text) < 60:
+        return False
+    if toks[0].rstrip(".,") not in _STRONG_VERBS:
+        return False
+    return not any(t.strip(".,;:") in _FILLER_WORDS for t in toks)
+
+
+# Rewrites keyed by (mode, bullet content) hash: identical bullets across
+# resume versions / retries skip the billed round-trip entirely.
+_HUMANIZE_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_HUMANIZE_CACHE_MAX = 4096
+
+
+def _cache_key(mode_id: str, bullet_text: str) -> str:
+    return hashlib.blake2b(f"{mode_id}|{bullet_text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_put(key: str, value: str) -> None:
+    _HUMANIZE_CACHE[key] = value
+    _HUMANIZE_CACHE.move_to_end(key)
+    while len(_HUMANIZE_CACHE) > _HUMANIZE_CACHE_MAX:
+        _HUMANIZE_CACHE.popitem(last=False)
+
+
+async def _rewrite_bullet(
+    client: httpx.AsyncClient,
+    bullet_text: str,
+    idx: int,
+    base_payload: dict,
+    headers: dict,
+) -> str:
+    """
+    Call AIHumanize for a single bullet with retry + sanitize.
+    `base_payload` / `headers` are built once per batch by the caller;
+    the payload dict is assembled once here and reused across retries.
+    """
+    key = _cache_key(base_payload["model"], bullet_text)
+    cached = _HUMANIZE_CACHE.get(key)
+    if cached is not None:
+        _HUMANIZE_CACHE.move_to_end(key)
+        log_event("aihumanize_cache_hit", {"idx": idx})
+        return cached
+
+    payload = {**base_payload, "data": bullet_text}
+
+    for attempt in range(RETRIES + 1):
+        retry_after: Optional[float] = None
+        try:
+            r = await client.post(AIHUMANIZE_API_URL, headers=headers, content=orjson.dumps(payload))
+            r.raise_for_status()
+            if _BAD_BYTES_RE.search(r.content):
+                log_event("aihumanize_bullet_rejected_preamble", {"idx": idx, "attempt": attempt})
+                return bullet_text.rstrip(".")
+            data = orjson.loads(r.content)
+            if isinstance(data, dict) and data.get("code") == 200 and data.get("data"):
+                # CPU-bound regex passes run in a worker thread so the
+                # event loop keeps servicing the other in-flight bullets
+                candidate = await asyncio.to_thread(clean_humanized_text, str(data["data"]).strip())
+                # Normalize once here (bullets usually avoid a trailing
+                # period) so the rebuild loop doesn't re-strip
+                candidate = candidate.rstrip(".")
+                if candidate:
+                    _cache_put(key, candidate)
+                    log_event("aihumanize_bullet_ok", {"idx": idx, "len": len(candidate), "attempt": attempt})
+                    return candidate
+                else:
+                    log_event("aihumanize_bullet_revert_unsafe", {"idx": idx, "attempt": attempt})
+                    return bullet_text.rstrip(".")
+            else:
+                # Unexpected response shape — retry
+                log_event("aihumanize_bad_response", {"idx": idx, "attempt": attempt, "resp": data})
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if status not in (408, 429) and status < 500:
+                # Client error: retrying won't change the answer
+                log_event("aihumanize_bullet_client_error", {"idx": idx, "status": status})
+                return bullet_text.rstrip(".")
+            ra = e.response.headers.get("Retry-After")
+            try:
+                retry_after = float(ra) if ra else None
+            except ValueError:
+                retry_after = None
+            log_event("aihumanize_bullet_error", {"idx": idx, "attempt": attempt, "status": status})
+        except Exception as e:
+            # Timeouts/transport errors — worth retrying
+            log_event("aihumanize_bullet_error", {"idx": idx, "attempt": attempt, "error": str(e)})
+        # Honor server pacing when given; otherwise exponential backoff
+        # with jitter so concurrent tasks don't re-stampede in lockstep
+        if attempt < RETRIES:
+            if retry_after is not None:
+                delay = retry_after
+            else:
+                delay = min(30.0, 0.5 * (2 ** attempt)) + random.uniform(0, 0.5)
+            await asyncio.sleep(delay)
+
+    log_event("aihumanize_bullet_fallback", {"idx": idx})
+    return bullet_text.rstrip(".")
+
+
+# Several bullets per API call: one set of headers/TLS records and one
+# rate-limit slot amortized over the whole group. The sentinel survives
+# tone rewriting because it looks like markup, not prose.
+BATCH_SIZE = int(os.getenv("AIHUMANIZE_BATCH_SIZE", "8"))
+_BATCH_SEP = "\n<<<BULLET_SEP>>>\n"
+_BATCH_SPLIT_RE = re.compile(r"\s*<<<BULLET_SEP>>>\s*")
+
+
+async def _rewrite_bullets_batch(
+    client: httpx.AsyncClient,
+    bullets: List[str],
+    base_idx: int,
+    base_payload: dict,
+    headers: dict,
+) -> List[str]:
+    """
+    Rewrite a group of bullets with a single AIHumanize round-trip,
+    joined by a sentinel and re-split on response. Falls back to
+    per-bullet calls (with their full retry/backoff) when the response
+    does not split back into the same number of parts.
+    """
+    if len(bullets) == 1:
+        return [await _rewrite_bullet(client, bullets[0], base_idx, base_payload, headers)]
+
+    payload = {**base_payload, "data": _BATCH_SEP.join(bullets)}
+
+    try:
+        r = await client.post(AIHUMANIZE_API_URL, headers=headers, content=orjson.dumps(payload))
+        r.raise_for_status()
+        if _BAD_BYTES_RE.search(r.content):
+            log_event("aihumanize_batch_rejected_preamble", {"base_idx": base_idx})
+            return [b.rstrip(".") for b in bullets]
+        data = orjson.loads(r.content)
+        if isinstance(data, dict) and data.get("code") == 200 and data.get("data"):
+            parts = _BATCH_SPLIT_RE.split(str(data["data"]).strip())
+            if len(parts) == len(bullets):
+                out: List[str] = []
+                for orig, part in zip(bullets, parts):
+                    candidate = await asyncio.to_thread(clean_humanized_text, part.strip())
+                    candidate = candidate.rstrip(".")
+                    if candidate:
+                        _cache_put(_cache_key(base_payload["model"], orig), candidate)
+                        out.append(candidate)
+                    else:
+                        out.append(orig.rstrip("."))
+                log_event("aihumanize_batch_ok", {"base_idx": base_idx, "bullets": len(bullets)})
+                return out
+            log_event(
+                "aihumanize_batch_split_mismatch",
+                {"base_idx": base_idx, "expected": len(bullets), "got": len(parts)},
+            )
+        else:
+            log_event("aihumanize_batch_bad_response", {"base_idx": base_idx})
+    except Exception as e:
+        log_event("aihumanize_batch_error", {"base_idx": base_idx, "error": str(e)})
+
+    # Per-bullet fallback keeps the original retry semantics
+    return list(
+        await asyncio.gather(
+            *[_rewrite_bullet(client, b, base_idx + i, base_payload, headers) for i, b in enumerate(bullets)]
+        )
+    )
+
+
+# ============================================================
+# 🧠 Public Core: Humanize all \resumeItem bullets
+# ============================================================
+
+async def humanize_resume_items(
+    tex_content: str,
+    mode: str = AIHUMANIZE_DEFAULT_MODE,
+    email: Optional[str] = None,
+) -> Tuple[str, int, int]:
+    """
+    Humanize all \resumeItem{...} bullets concurrently.
+
+    Returns:
+        (new_tex, total_found, total_rewritten)
+    """
+    if not config.HUMANIZE_API_KEY:
+        raise RuntimeError("HUMANIZE_API_KEY missing in environment.")
+
+    spans = _find_resume_items(tex_content or "")
+    total_found = len(spans)
+    if total_found == 0:
+        log_event("aihumanize_no_bullets", {})
+        return tex_content, 0, 0
+
+    mode_id = AIHUMANIZE_MODE_MAP.get(mode.lower().strip(), AIHUMANIZE_MODE_MAP["quality"])
+    mail = (email or AIHUMANIZE_DEFAULT_EMAIL).strip()
+
+    client = _get_client()
+
+    # Immutable request pieces built once per document, not per bullet
+    # (and not per retry): N bullets cost one headers dict, not 3N.
+    headers = {
+        "Authorization": config.HUMANIZE_API_KEY,
+        "Content-Type": "application/json",
+    }
+    base_payload = {"model": mode_id, "mail": mail}
+
+    # Deduplicate identical stripped content so each unique bullet costs
+    # one API call; results fan back out to every duplicate span.
+    unique_map: "OrderedDict[str, List[int]]" = OrderedDict()
+    for i, b in enumerate(spans):
+        unique_map.setdefault(b.content_stripped, []).append(i)
+
+    # Resolve what we can locally (empty / trivial / cached), then batch
+    # the rest into grouped API calls of BATCH_SIZE bullets each.
+    results: dict = {}
+    pending: List[str] = []
+    for idx, content_stripped in enumerate(unique_map, start=1):
+        if not content_stripped:
+            results[content_stripped] = content_stripped
+            continue
+        # Untouched bullets still get the trailing-period normalization
+        # the rewritten ones receive
+        # Trivial placeholders have nothing to humanize — skip the
+        # network path and keep them out of the concurrency budget
+        if len(content_stripped) < 20 or content_stripped.count(" ") < 3:
+            log_event("aihumanize_bullet_skipped_short", {"idx": idx, "len": len(content_stripped)})
+            results[content_stripped] = content_stripped.rstrip(".")
+            continue
+        # Already reads like a humanized bullet — don't pay for a rewrite
+        if _looks_polished(content_stripped):
+            log_event("aihumanize_skipped_polished", {"idx": idx, "len": len(content_stripped)})
+            results[content_stripped] = content_stripped.rstrip(".")
+            continue
+        cached = _HUMANIZE_CACHE.get(_cache_key(mode_id, content_stripped))
+        if cached is not None:
+            _HUMANIZE_CACHE.move_to_end(_cache_key(mode_id, content_stripped))
+            log_event("aihumanize_cache_hit", {"idx": idx})
+            results[content_stripped] = cached
+            continue
+        pending.append(content_stripped)
+
+    async def _batch_task(batch: List[str], base_idx: int) -> List[str]:
+        await _acquire_slot()
+        try:
+            return await _rewrite_bullets_batch(client, batch, base_idx, base_payload, headers)
+        finally:
+            await _release_slot()
+
+    batches = [pending[i : i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+    batch_results = await asyncio.gather(
+        *[_batch_task(b, i * BATCH_SIZE + 1) for i, b in enumerate(batches)], return_exceptions=False
+    )
+    for batch, outs in zip(batches, batch_results):
+        results.update(zip(batch, outs))
+
+    rewritten_texts: List[str] = [""] * len(spans)
+    for content_stripped, indices in unique_map.items():
+        result = results[content_stripped]
+        for i in indices:
+            rewritten_texts[i] = result
+
+    # Rebuild the LaTeX safely by streaming spans into one buffer
+    buf = io.StringIO()
+    last = 0
+    total_rewritten = 0
+    for (span, new_txt) in zip(spans, rewritten_texts):
+        buf.write(tex_content[last:span.start])
+        # Results are already stripped/period-normalized upstream
+        if new_txt != span.content_stripped:
+            total_rewritten += 1
+        buf.write(new_txt)
+        last = span.end
+    buf.write(tex_content[last:])
+
+    new_tex = buf.getvalue()
+
+    # Final safety: strip accidental preamble fragments
+    new_tex = _PREAMBLE_RE.sub("", new_tex)
+    new_tex = _BLANK_RE.sub("\n\n", new_tex).strip()
+
+    log_event("aihumanize_complete", {"found": total_found, "rewritten": total_rewritten, "mode": mode})
+    return new_tex, total_found, total_rewritten
+
+
+# ============================================================
+# 🌐 FastAPI endpoints (optional, convenient for frontend)
+# ============================================================
+
+class BulletsReq(BaseModel):
+    tex_content: str = Field(..., description="LaTeX content containing \\resumeItem{...} bullets.")
+    mode: str = Field(AIHUMANIZE_DEFAULT_MODE, description="quality | balance | enhanced")
+    email: Optional[str] = Field(None, description="Account email for AIHumanize (optional override).")
+
+@router.post("/bullets")
+async def api_humanize_bullets(req: BulletsReq):
+    """
+    Rewrites only \\resumeItem{...} bullets inside the provided LaTeX string.
+    Returns sanitized LaTeX. Requires HUMANIZE_API_KEY in env.
+    """
+    if not config.HUMANIZE_API_KEY:
+        raise HTTPException(status_code=400, detail="HUMANIZE_API_KEY missing in environment.")
+    try:
+        new_tex, found, rewritten = await humanize_resume_items(req.tex_content, mode=req.mode, email=req.email)
+        return {
+            "ok": True,
+            "tex_content": new_tex,
+            "found": found,
+            "rewritten": rewritten,
+            "mode": req.mode,
+        }
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"AIHumanize processing failed: {e}")
+
+
+@router.get("/config")
+async def humanize_config():
+    """
+    Observability for the concurrency/batching knobs: the authoritative
+    limit, the current runtime ceiling, and cache occupancy.
+    """
+    return {
+        "max_concurrent": MAX_CONCURRENT,
+        "active_ceiling": _max_concurrent,
+        "active_now": _active,
+        "batch_size": BATCH_SIZE,
+        "timeout_sec": TIMEOUT_SEC,
+        "retries": RETRIES,
+        "cache_entries": len(_HUMANIZE_CACHE),
+    }
+
+
+# ============================================================
+# 🧪 Local CLI test
+# ============================================================
+
+if __name__ == "__main__":
+    async def _run():
+        sample_tex = r"""
+        \resumeItem{worked on python scripts for data processing}
+        \resumeItem{helped team with docker deployments}
+        \resumeItem{deployed 3 APIs with 99\% uptime}
+        """
+        # Note: requires HUMANIZE_API_KEY in your env to actually call service.
+        try:
+            out, found, rewritten = await humanize_resume_items(sample_tex, mode="quality")
+            print("\n=== Found:", found, "Rewritten:", rewritten, "===\n")
+            print(out)
+        except Exception as e:
+            print("Local test (no key?) error:", e)
+
+    asyncio.run(_run())
@@ -1,259 +1,460 @@
-"""
-============================================================
- HIREX v2.1.0 — talk.py
- ------------------------------------------------------------
- "Talk to HIREX" conversational endpoint.
- Answers job-application or interview questions using
- JD + resume context with optional SuperHuman humanization.
-
- Author: Sri Akash Kadali
-============================================================
-"""
-
-import json
-import time
-from pathlib import Path
-from typing import Optional, Dict, Any
-
-import httpx
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from openai import AsyncOpenAI
-
-from backend.core import config
-from backend.core.utils import log_event, safe_filename
-from backend.core.security import secure_tex_input
-
-router = APIRouter(prefix="/api/talk", tags=["talk"])
-openai_client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
-
-# Where /api/context/save stores contexts
-CONTEXT_DIR: Path = config.get_contexts_dir()
-
-# Cheap, reliable summarizer model (override-able from env)
-SUMMARIZER_MODEL = getattr(config, "TALK_SUMMARY_MODEL", "gpt-4o-mini")
-
-
-# ============================================================
-# 🧠 REQUEST MODEL
-# ============================================================
-class TalkReq(BaseModel):
-    # If jd_text / resume are omitted, service will pull from saved context.
-    jd_text: str = ""
-    question: str
-    resume_tex: Optional[str] = None
-    resume_plain: Optional[str] = None
-    tone: str = "balanced"
-    humanize: bool = True
-    model: str = getattr(config, "DEFAULT_MODEL", "gpt-4o-mini")
-
-    # 🔁 Context fallback controls
-    context_id: Optional[str] = None          # equals saved title/id
-    title: Optional[str] = None               # alias of context_id
-    use_latest: bool = True                   # if no id/title, use latest saved
-
-
-# ============================================================
-# 🧩 CONTEXT HELPERS
-# ============================================================
-
-def _ctx_path(id_or_title: str) -> Path:
-    return CONTEXT_DIR / f"{safe_filename(id_or_title)}.json"
-
-
-def _latest_path() -> Optional[Path]:
-    files = sorted(CONTEXT_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-    return files[0] if files else None
-
-
-def _read_json(path: Optional[Path]) -> Dict[str, Any]:
-    if not path or not path.exists():
-        return {}
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
-
-
-def _load_context(context_id: Optional[str], title: Optional[str], use_latest: bool) -> Dict[str, Any]:
-    path: Optional[Path] = None
-    key = (context_id or title or "").strip()
-    if key:
-        path = _ctx_path(key)
-    elif use_latest:
-        path = _latest_path()
-    ctx = _read_json(path)
-    if ctx:
-        log_event("talk_context_used", {"title": ctx.get("title"), "company": ctx.get("company")})
-    return ctx
-
-
-# ============================================================
-# 🧩 MODEL CALL HELPERS
-# ============================================================
-
-async def extract_resume_summary(resume_tex: Optional[str], resume_plain: Optional[str]) -> str:
-    """
-    Compress resume content into factual bullet points.
-    Strips formatting, avoids hallucination.
-    """
-    if not (resume_tex or resume_plain):
-        return "No resume text provided."
-
-    text_input = (resume_plain or resume_tex or "").strip()
-    sys_prompt = (
-        "Summarize this resume into 6–10 concise factual bullet points "
-        "about key skills, technologies, and experiences. "
-        "Do NOT fabricate or guess. Output plain-text bullets."
-    )
-
-    try:
-        resp = await openai_client.responses.create(
-            model=SUMMARIZER_MODEL,
-            input=[
-                {"role": "system", "content": sys_prompt},
-                {"role": "user", "content": text_input[:3500]},
-            ],
-            temperature=0.25,
-            max_output_tokens=300,
-        )
-        # New Responses API shape
-        summary_text = resp.output[0].content[0].text.strip()
-        return secure_tex_input(summary_text)  # type: ignore
-    except Exception as e:
-        print(f"[WARN] Resume summarization failed: {e}")
-        # Fallback to a truncated slice of the provided resume text
-        return secure_tex_input(text_input[:1200])  # type: ignore
-
-
-async def generate_answer(jd_text: str, resume_summary: str, question: str, model: str) -> str:
-    """
-    Produce factual, JD-aware short answers.
-    Ensures truth alignment with resume.
-    """
-    sys_prompt = (
-        "You are HIREX Assistant, an AI recruiter co-pilot. "
-        "Use only information grounded in the job description and resume. "
-        "Never fabricate or over-claim. "
-        "Keep the tone professional, confident, and natural. "
-        "Answer concisely in 1–3 sentences."
-    )
-
-    user_prompt = (
-        f"Job Description:\n{jd_text[:3500]}\n\n"
-        f"Resume Summary:\n{resume_summary}\n\n"
-        f"Question:\n{question.strip()}"
-    )
-
-    start = time.time()
-    try:
-        resp = await openai_client.responses.create(
-            model=model,
-            input=[
-                {"role": "system", "content": sys_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.55,
-            max_output_tokens=300,
-        )
-        latency = round(time.time() - start, 2)
-        answer = resp.output[0].content[0].text.strip()
-        tokens = len(answer.split())
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Answer generation failed: {e}")
-
-    log_event("talk_answer_raw", {"latency": latency, "tokens": tokens, "model": model})
-    return secure_tex_input(answer)  # type: ignore
-
-
-async def humanize_text(answer_text: str, tone: str) -> str:
-    """
-    Refine the tone and flow via SuperHuman rewrite API.
-    Falls back gracefully if unavailable.
-    """
-    url = f"{config.API_BASE_URL}/api/superhuman/rewrite"
-    payload = {"text": answer_text, "mode": "paragraph", "tone": tone, "latex_safe": True}
-
-    try:
-        async with httpx.AsyncClient(timeout=45.0) as client:
-            r = await client.post(url, json=payload)
-        r.raise_for_status()
-        data = r.json()
-        return secure_tex_input(data.get("rewritten", answer_text))  # type: ignore
-    except Exception as e:
-        print(f"[WARN] SuperHuman call failed: {e}")
-        return answer_text
-
-
-# ============================================================
-# 🚀 MAIN ENDPOINT
-# ============================================================
-@router.post("/answer")
-async def talk_to_hirex(req: TalkReq):
-    """
-    Generate a contextual, factual, optionally humanized answer for
-    job-application or interview questions.
-
-    Behavior:
-      • If jd_text / resume not provided, pulls from the latest (or specified)
-        saved context created by /api/context/save.
-      • Returns both 'answer' (final) and 'draft_answer' (pre-humanize).
-    """
-
-    # Pull context if needed
-    jd_text = (req.jd_text or "").strip()
-    resume_tex = (req.resume_tex or "").strip()
-
-    if not jd_text or not resume_tex:
-        ctx = _load_context(req.context_id, req.title, req.use_latest)
-        if ctx:
-            jd_text = jd_text or (ctx.get("jd_text") or "")
-            # Prefer humanized_tex; fall back to resume_tex
-            resume_tex = resume_tex or (ctx.get("humanized_tex") or ctx.get("resume_tex") or "")
-            ctx_title = ctx.get("title")
-        else:
-            ctx_title = None
-    else:
-        ctx_title = None
-
-    if not jd_text.strip():
-        raise HTTPException(status_code=400, detail="Job Description missing. Provide jd_text or save a context first.")
-    if not (resume_tex or req.resume_plain):
-        raise HTTPException(status_code=400, detail="Resume text missing. Provide resume_tex/plain or save a context first.")
-
-    # 1) Resume summary
-    resume_summary = await extract_resume_summary(resume_tex, req.resume_plain)
-
-    # 2) Raw answer generation
-    draft_answer = await generate_answer(jd_text, resume_summary, req.question, req.model)
-
-    # 3) Optional humanization
-    final_answer = await humanize_text(draft_answer, req.tone) if req.humanize else draft_answer
-
-    # 4) Log metadata
-    log_event(
-        "talk_to_hirex",
-        {
-            "question": req.question,
-            "tone": req.tone,
-            "humanize": req.humanize,
-            "jd_len": len(jd_text),
-            "resume_len": len(resume_tex or req.resume_plain or ""),
-            "model": req.model,
-            "context_used": bool(ctx_title),
-            "context_title": ctx_title,
-        },
-    )
-
-    # 5) Structured return (include 'answer' alias for frontend)
-    return {
-        "question": req.question.strip(),
-        "resume_summary": resume_summary,
-        "draft_answer": draft_answer,
-        "final_text": final_answer,
-        "answer": final_answer,           # alias for UI compatibility
-        "tone": req.tone,
-        "humanized": req.humanize,
-        "model": req.model,
-        "context_title": ctx_title,
-    }
+"""
+============================================================
+ HIREX v2.1.0 — talk.py
+ ------------------------------------------------------------
+ "Talk to HIREX" conversational endpoint.
+ Answers job-application or interview questions using
+ JD + resume context with optional SuperHuman humanization.
+
+ Author: Sri Akash Kadali
+============================================================
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import aiofiles
+import httpx
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from openai import AsyncOpenAI
+
+from backend.core import config
+from backend.core.openai_batcher import batcher as openai_batcher
+from backend.core.utils import log_event, safe_filename, simple_hash
+from backend.core.security import secure_tex_input
+
+router = APIRouter(prefix="/api/talk", tags=["talk"])
+openai_client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+
+# Where /api/context/save stores contexts
+CONTEXT_DIR: Path = config.get_contexts_dir()
+
+# Cheap, reliable summarizer model (override-able from env)
+SUMMARIZER_MODEL = getattr(config, "TALK_SUMMARY_MODEL", "gpt-4o-mini")
+
+# Fan-out bound for /answer_batch so a big batch can't exhaust the
+# OpenAI concurrency budget
+MAX_CONCURRENCY = int(os.getenv("HIREX_MAX_CONCURRENCY", "16"))
+_batch_sem = asyncio.Semaphore(MAX_CONCURRENCY)
+
+
+# ============================================================
+# 🧠 REQUEST MODEL
+# ============================================================
+class TalkReq(BaseModel):
+    # If jd_text / resume are omitted, service will pull from saved context.
+    jd_text: str = ""
+    question: str
+    resume_tex: Optional[str] = None
+    resume_plain: Optional[str] = None
+    tone: str = "balanced"
+    humanize: bool = True
+    model: str = getattr(config, "DEFAULT_MODEL", "gpt-4o-mini")
+
+    # 🔁 Context fallback controls
+    context_id: Optional[str] = None          # equals saved title/id
+    title: Optional[str] = None               # alias of context_id
+    use_latest: bool = True                   # if no id/title, use latest saved
+
+
+# ============================================================
+# 🧩 CONTEXT HELPERS
+# ============================================================
+
+def _ctx_path(id_or_title: str) -> Path:
+    return CONTEXT_DIR / f"{safe_filename(id_or_title)}.meta.json"
+
+
+# Hot sessions ask many questions against one context: parsed contexts
+# are cached per path and revalidated by mtime, and the "latest" lookup
+# re-scans the directory only when its own mtime advances. Entries carry
+# the merged blob payload (pdf_base64 can be several MB), so the LRU is
+# kept deliberately small.
+_CTX_CACHE_MAX = 8
+_CTX_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_LATEST_MEMO: Dict[str, Any] = {"dir_mtime": None, "path": None}
+
+
+def _latest_path() -> Optional[Path]:
+    try:
+        dir_mtime = CONTEXT_DIR.stat().st_mtime
+    except OSError:
+        return None
+    if _LATEST_MEMO["dir_mtime"] == dir_mtime:
+        return _LATEST_MEMO["path"]
+    files = sorted(CONTEXT_DIR.glob("*.meta.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    path = files[0] if files else None
+    _LATEST_MEMO.update(dir_mtime=dir_mtime, path=path)
+    return path
+
+
+async def _read_json(path: Optional[Path]) -> Dict[str, Any]:
+    if not path or not path.exists():
+        return {}
+    try:
+        async with aiofiles.open(path, "r", encoding="utf-8") as f:
+            return json.loads(await f.read())
+    except Exception:
+        return {}
+
+
+async def _read_context(path: Optional[Path]) -> Dict[str, Any]:
+    """Merge a context's metadata sidecar with its heavy blob payload."""
+    if path is None:
+        return {}
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    key = str(path)
+    entry = _CTX_CACHE.get(key)
+    if entry is not None and entry[0] == mtime_ns:
+        _CTX_CACHE.move_to_end(key)
+        return entry[1]
+    ctx = await _read_json(path)
+    if ctx:
+        blob = await _read_json(path.with_name(path.name.replace(".meta.json", ".blob.json")))
+        ctx.update(blob)
+        _CTX_CACHE[key] = (mtime_ns, ctx)
+        while len(_CTX_CACHE) > _CTX_CACHE_MAX:
+            _CTX_CACHE.popitem(last=False)
+    return ctx
+
+
+async def _load_context(context_id: Optional[str], title: Optional[str], use_latest: bool) -> Dict[str, Any]:
+    path: Optional[Path] = None
+    key = (context_id or title or "").strip()
+    if key:
+        path = _ctx_path(key)
+    elif use_latest:
+        path = _latest_path()
+    ctx = await _read_context(path)
+    if ctx:
+        log_event("talk_context_used", {"title": ctx.get("title"), "company": ctx.get("company")})
+    return ctx
+
+
+# ============================================================
+# 🧩 MODEL CALL HELPERS
+# ============================================================
+
+async def extract_resume_summary(resume_tex: Optional[str], resume_plain: Optional[str]) -> str:
+    """
+    Compress resume content into factual bullet points.
+    Strips formatting, avoids hallucination.
+    """
+    if not (resume_tex or resume_plain):
+        return "No resume text provided."
+
+    text_input = (resume_plain or resume_tex or "").strip()
+    sys_prompt = (
+        "Summarize this resume into 6–10 concise factual bullet points "
+        "about key skills, technologies, and experiences. "
+        "Do NOT fabricate or guess. Output plain-text bullets."
+    )
+
+    try:
+        resp = await openai_client.responses.create(
+            model=SUMMARIZER_MODEL,
+            input=[
+                {"role": "system", "content": sys_prompt},
+                {"role": "user", "content": text_input[:3500]},
+            ],
+            temperature=0.25,
+            max_output_tokens=300,
+        )
+        # New Responses API shape
+        summary_text = resp.output[0].content[0].text.strip()
+        return secure_tex_input(summary_text)  # type: ignore
+    except Exception as e:
+        print(f"[WARN] Resume summarization failed: {e}")
+        # Fallback to a truncated slice of the provided resume text
+        return secure_tex_input(text_input[:1200])  # type: ignore
+
+
+# Resume summaries are question-independent: one summary serves every
+# question asked against the same resume. Resolved futures double as the
+# in-memory cache and give single-flight behavior (concurrent callers of
+# the same resume share one OpenAI call); a small disk cache under
+# CACHE_DIR keeps restarts warm.
+_SUMMARY_CACHE_DIR = config.CACHE_DIR / "resume_summaries"
+_SUMMARY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# Bounded like _humanize_cache: every distinct resume adds an entry, so
+# the map would otherwise grow for the life of the process. Only done
+# futures are evicted — in-flight ones still have waiters (and a drop
+# would just fall back to the disk cache on the next ask anyway).
+_SUMMARY_FUTURES_MAX = 256
+_summary_futures: "OrderedDict[str, asyncio.Future[str]]" = OrderedDict()
+
+
+async def cached_resume_summary(resume_tex: Optional[str], resume_plain: Optional[str]) -> str:
+    """
+    Memoized wrapper around extract_resume_summary keyed by resume
+    content hash. Skips the summarizer model entirely on a warm cache.
+    """
+    if not (resume_tex or resume_plain):
+        return await extract_resume_summary(resume_tex, resume_plain)
+
+    key = simple_hash(f"{resume_tex or ''}\x00{resume_plain or ''}", 32)
+    fut = _summary_futures.get(key)
+    if fut is not None:
+        _summary_futures.move_to_end(key)
+        log_event("talk_summary_cache_hit", {"key": key, "source": "memory" if fut.done() else "inflight"})
+        return await asyncio.shield(fut)
+
+    fut = asyncio.get_running_loop().create_future()
+    _summary_futures[key] = fut
+    try:
+        disk_path = _SUMMARY_CACHE_DIR / f"{key}.json"
+        summary = ""
+        if disk_path.exists():
+            try:
+                summary = json.loads(disk_path.read_text(encoding="utf-8")).get("summary", "")
+            except Exception:
+                summary = ""
+        if summary:
+            log_event("talk_summary_cache_hit", {"key": key, "source": "disk"})
+        else:
+            summary = await extract_resume_summary(resume_tex, resume_plain)
+            try:
+                disk_path.write_text(json.dumps({"summary": summary}), encoding="utf-8")
+            except Exception:
+                pass
+    except BaseException as e:
+        # BaseException so a client disconnect (CancelledError) can't
+        # leave a forever-pending future trapping every later caller
+        _summary_futures.pop(key, None)
+        if not fut.done():
+            if isinstance(e, Exception):
+                fut.set_exception(e)
+            else:
+                fut.cancel()
+        raise
+    fut.set_result(summary)
+    if len(_summary_futures) > _SUMMARY_FUTURES_MAX:
+        for k in [k for k, f in _summary_futures.items() if f.done()]:
+            if len(_summary_futures) <= _SUMMARY_FUTURES_MAX:
+                break
+            del _summary_futures[k]
+    return summary
+
+
+async def generate_answer(jd_text: str, resume_summary: str, question: str, model: str) -> str:
+    """
+    Produce factual, JD-aware short answers.
+    Ensures truth alignment with resume.
+    """
+    sys_prompt = (
+        "You are HIREX Assistant, an AI recruiter co-pilot. "
+        "Use only information grounded in the job description and resume. "
+        "Never fabricate or over-claim. "
+        "Keep the tone professional, confident, and natural. "
+        "Answer concisely in 1–3 sentences."
+    )
+
+    user_prompt = (
+        f"Job Description:\n{jd_text[:3500]}\n\n"
+        f"Resume Summary:\n{resume_summary}\n\n"
+        f"Question:\n{question.strip()}"
+    )
+
+    start = time.time()
+    try:
+        # Micro-batched: concurrent identical questions (e.g. duplicates
+        # inside /answer_batch) share one API call
+        resp = await openai_batcher.submit(
+            openai_client,
+            model=model,
+            input=[
+                {"role": "system", "content": sys_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.55,
+            max_output_tokens=300,
+        )
+        latency = round(time.time() - start, 2)
+        answer = resp.output[0].content[0].text.strip()
+        tokens = len(answer.split())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Answer generation failed: {e}")
+
+    log_event("talk_answer_raw", {"latency": latency, "tokens": tokens, "model": model})
+    return secure_tex_input(answer)  # type: ignore
+
+
+async def humanize_text(answer_text: str, tone: str) -> str:
+    """
+    Refine the tone and flow via SuperHuman rewrite API.
+    Falls back gracefully if unavailable.
+    """
+    url = f"{config.API_BASE_URL}/api/superhuman/rewrite"
+    payload = {"text": answer_text, "mode": "paragraph", "tone": tone, "latex_safe": True}
+
+    try:
+        async with httpx.AsyncClient(timeout=45.0) as client:
+            r = await client.post(url, json=payload)
+        r.raise_for_status()
+        data = r.json()
+        return secure_tex_input(data.get("rewritten", answer_text))  # type: ignore
+    except Exception as e:
+        print(f"[WARN] SuperHuman call failed: {e}")
+        return answer_text
+
+
+# Humanization is the other repeatable LLM round-trip: identical drafts
+# with the same tone always rewrite the same way, and very short drafts
+# have no register to fix. LRU in memory, plain text files on disk.
+_HUMANIZE_MIN_WORDS = int(os.getenv("HIREX_MIN_HUMANIZE_WORDS", "20"))
+_HUMANIZE_CACHE_DIR = config.CACHE_DIR / "humanize"
+_HUMANIZE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+_HUMANIZE_CACHE_MAX = 1024
+_humanize_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+async def cached_humanize(answer_text: str, tone: str) -> str:
+    """
+    humanize_text with a short-draft short-circuit and an LRU +
+    disk cache keyed by (draft hash, tone).
+    """
+    if len(answer_text.split()) < _HUMANIZE_MIN_WORDS:
+        log_event("talk_humanize_skipped_short", {"words": len(answer_text.split())})
+        return answer_text
+
+    key = f"{simple_hash(answer_text, 32)}_{safe_filename(tone)}"
+    cached = _humanize_cache.get(key)
+    if cached is not None:
+        _humanize_cache.move_to_end(key)
+        log_event("talk_humanize_cache_hit", {"key": key, "source": "memory"})
+        return cached
+
+    disk_path = _HUMANIZE_CACHE_DIR / f"{key}.txt"
+    if disk_path.exists():
+        try:
+            cached = disk_path.read_text(encoding="utf-8")
+        except Exception:
+            cached = None
+        if cached:
+            _humanize_cache[key] = cached
+            log_event("talk_humanize_cache_hit", {"key": key, "source": "disk"})
+            return cached
+
+    out = await humanize_text(answer_text, tone)
+    _humanize_cache[key] = out
+    while len(_humanize_cache) > _HUMANIZE_CACHE_MAX:
+        _humanize_cache.popitem(last=False)
+    try:
+        disk_path.write_text(out, encoding="utf-8")
+    except Exception:
+        pass
+    return out
+
+
+# ============================================================
+# 🚀 MAIN ENDPOINT
+# ============================================================
+async def _answer_one(req: TalkReq) -> Dict[str, Any]:
+    """Shared core for /answer and /answer_batch."""
+
+    # Pull context if needed
+    jd_text = (req.jd_text or "").strip()
+    resume_tex = (req.resume_tex or "").strip()
+
+    if not jd_text or not resume_tex:
+        ctx = await _load_context(req.context_id, req.title, req.use_latest)
+        if ctx:
+            jd_text = jd_text or (ctx.get("jd_text") or "")
+            # Prefer humanized_tex; fall back to resume_tex
+            resume_tex = resume_tex or (ctx.get("humanized_tex") or ctx.get("resume_tex") or "")
+            ctx_title = ctx.get("title")
+        else:
+            ctx_title = None
+    else:
+        ctx_title = None
+
+    if not jd_text.strip():
+        raise HTTPException(status_code=400, detail="Job Description missing. Provide jd_text or save a context first.")
+    if not (resume_tex or req.resume_plain):
+        raise HTTPException(status_code=400, detail="Resume text missing. Provide resume_tex/plain or save a context first.")
+
+    # 1) Resume summary (cached per resume content across questions).
+    # Launched as a task so any future question-independent prep can
+    # overlap with it; awaited only where the answer needs it.
+    summary_task = asyncio.create_task(cached_resume_summary(resume_tex, req.resume_plain))
+
+    # 2) Raw answer generation
+    resume_summary = await summary_task
+    draft_answer = await generate_answer(jd_text, resume_summary, req.question, req.model)
+
+    # 3) Optional humanization (cached; skipped for trivial drafts)
+    final_answer = await cached_humanize(draft_answer, req.tone) if req.humanize else draft_answer
+
+    # 4) Log metadata
+    log_event(
+        "talk_to_hirex",
+        {
+            "question": req.question,
+            "tone": req.tone,
+            "humanize": req.humanize,
+            "jd_len": len(jd_text),
+            "resume_len": len(resume_tex or req.resume_plain or ""),
+            "model": req.model,
+            "context_used": bool(ctx_title),
+            "context_title": ctx_title,
+        },
+    )
+
+    # 5) Structured return (include 'answer' alias for frontend)
+    return {
+        "question": req.question.strip(),
+        "resume_summary": resume_summary,
+        "draft_answer": draft_answer,
+        "final_text": final_answer,
+        "answer": final_answer,           # alias for UI compatibility
+        "tone": req.tone,
+        "humanized": req.humanize,
+        "model": req.model,
+        "context_title": ctx_title,
+    }
+
+
+@router.post("/answer")
+async def talk_to_hirex(req: TalkReq):
+    """
+    Generate a contextual, factual, optionally humanized answer for
+    job-application or interview questions.
+
+    Behavior:
+      • If jd_text / resume not provided, pulls from the latest (or specified)
+        saved context created by /api/context/save.
+      • Returns both 'answer' (final) and 'draft_answer' (pre-humanize).
+    """
+    return await _answer_one(req)
+
+
+@router.post("/answer_batch")
+async def talk_to_hirex_batch(reqs: List[TalkReq]):
+    """
+    Answer several questions in parallel. Questions against the same
+    resume share one cached summary; the fan-out is bounded by
+    HIREX_MAX_CONCURRENCY so a large batch degrades to a queue instead
+    of a stampede.
+    """
+    if not reqs:
+        return {"count": 0, "answers": []}
+
+    async def _bounded(r: TalkReq) -> Dict[str, Any]:
+        async with _batch_sem:
+            try:
+                return await _answer_one(r)
+            except HTTPException as e:
+                return {"question": r.question, "error": e.detail, "status": e.status_code}
+
+    answers = await asyncio.gather(*[_bounded(r) for r in reqs])
+    log_event("talk_answer_batch", {"count": len(answers)})
+    return {"count": len(answers), "answers": answers}
@@ -0,0 +1,123 @@
+"""
+HIREX • core/openai_batcher.py
+Micro-batching window for OpenAI Responses calls.
+
+Concurrent submissions landing inside one window (50 ms or 32 entries,
+whichever first) are dispatched together with asyncio.gather, and
+identical (model, input) submissions inside a window share a single API
+call — a burst of duplicate questions from /answer_batch costs one
+round-trip instead of N.
+
+Author: Sri Akash Kadali
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from backend.core.utils import log_event
+
+# Window tuning: small enough to be invisible interactively, large
+# enough to catch a burst from a batch endpoint.
+WINDOW_S = 0.05
+MAX_BATCH = 32
+
+
+def _request_key(model: str, payload: str, opts: str) -> str:
+    return hashlib.blake2b(f"{model}|{payload}|{opts}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class OpenAIMicroBatcher:
+    """
+    Accumulates Responses-API submissions and flushes them as one
+    gather per window. Each waiter gets its result via a Future;
+    duplicate submissions within a window share one call.
+    """
+
+    def __init__(self, window_s: float = WINDOW_S, max_batch: int = MAX_BATCH):
+        self._window_s = window_s
+        self._max_batch = max_batch
+        self._lock = asyncio.Lock()
+        self._pending: Deque[Tuple[str, Any, Dict[str, Any]]] = deque()
+        self._futures: Dict[str, "asyncio.Future[Any]"] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def submit(self, client: Any, model: str, input: Any, **kwargs: Any) -> Any:
+        """
+        Queue one responses.create call; resolves with the API response.
+        """
+        # Sampling options are part of the identity: the same prompt at a
+        # different temperature/token budget must not share a response
+        key = _request_key(model, repr(input), repr(sorted(kwargs.items())))
+        async with self._lock:
+            fut = self._futures.get(key)
+            if fut is None:
+                fut = asyncio.get_running_loop().create_future()
+                self._futures[key] = fut
+                self._pending.append((key, client, {"model": model, "input": input, **kwargs}))
+                if len(self._pending) >= self._max_batch:
+                    self._spawn_flush(delay=0.0)
+                elif self._flusher is None or self._flusher.done():
+                    self._spawn_flush(delay=self._window_s)
+            else:
+                log_event("openai_batch_dedup", {"model": model})
+        return await asyncio.shield(fut)
+
+    def _spawn_flush(self, delay: float) -> None:
+        # Cancelling here can only hit a flusher still waiting out its
+        # window: a flusher clears self._flusher the moment it starts
+        # draining, and the drain itself runs shielded, so an in-flight
+        # dispatch is never aborted and its waiters never stranded.
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+        self._flusher = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float) -> None:
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                return  # superseded while still inside the window
+        self._flusher = None
+        # Shielded: a cancel landing after the sleep must not propagate
+        # into the gather once the futures have been popped
+        await asyncio.shield(self._drain())
+
+    async def _drain(self) -> None:
+        async with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            futures = {key: self._futures.pop(key) for key, _, _ in batch}
+        if not batch:
+            return
+
+        async def _one(key: str, client: Any, params: Dict[str, Any]) -> None:
+            fut = futures[key]
+            try:
+                resp = await client.responses.create(**params)
+            except BaseException as e:
+                if not fut.done():
+                    fut.set_exception(e)
+                if not isinstance(e, Exception):
+                    raise
+            else:
+                if not fut.done():
+                    fut.set_result(resp)
+
+        try:
+            await asyncio.gather(*[_one(k, c, p) for k, c, p in batch], return_exceptions=True)
+        finally:
+            # Whatever happened above, no waiter may be left pending
+            for fut in futures.values():
+                if not fut.done():
+                    fut.cancel()
+        if len(batch) > 1:
+            log_event("openai_batch_flush", {"calls": len(batch)})
+
+
+# Shared instance for modules that want coalescing without managing
+# their own batcher.
+batcher = OpenAIMicroBatcher()
@@ -1,162 +1,421 @@
-"""
-HIREX • core/utils.py (v2.0.0)
-Common utility functions shared across backend modules.
-For this version: No LaTeX escaping or text cleaning — passes LaTeX as-is.
-Author: Sri Akash Kadali
-"""
-
-from __future__ import annotations
-
-import re
-import html
-import hashlib
-import json
-from datetime import datetime
-from pathlib import Path
-from typing import Any, Dict, Optional
-
-# ============================================================
-# 📁 Logging path (honor config if available)
-# ============================================================
-try:
-    from backend.core import config as _cfg  # type: ignore
-    _DEFAULT_LOG_PATH = Path(getattr(_cfg, "LOG_PATH", "backend/data/logs/events.jsonl"))
-except Exception:
-    _DEFAULT_LOG_PATH = Path("backend/data/logs/events.jsonl")
-
-LOG_PATH = _DEFAULT_LOG_PATH
-LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-
-# ============================================================
-# 🔐 HASHING UTILITIES
-# ============================================================
-def sha256_str(data: Optional[str]) -> str:
-    """Generate a full SHA256 hash of a string."""
-    if data is None:
-        data = ""
-    return hashlib.sha256(data.encode("utf-8")).hexdigest()
-
-
-def simple_hash(data: Optional[str], length: int = 8) -> str:
-    """Generate a short deterministic hash (used for cache keys or content IDs)."""
-    return sha256_str(data or "")[:max(1, int(length))]
-
-
-# ============================================================
-# 📜 TEXT HELPERS (NO LATEX ESCAPING)
-# ============================================================
-def tex_escape(text: Optional[str]) -> str:
-    """
-    Passthrough for LaTeX text (no escaping).
-    Used when sending LaTeX to or receiving from OpenAI/Humanize.
-    """
-    return text or ""
-
-
-def html_escape(text: Optional[str]) -> str:
-    """HTML-escape text for safe display inside web UIs (not LaTeX)."""
-    return html.escape(text or "")
-
-
-def clean_text(text: Optional[str]) -> str:
-    """
-    Lightweight text cleaner (no normalization, no space compression).
-    Keeps LaTeX intact.
-    """
-    if not text:
-        return ""
-    return str(text)
-
-
-def safe_filename(name: Optional[str]) -> str:
-    """Convert a string into a safe, cross-platform filename."""
-    if not name:
-        return "file"
-    name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
-    # Avoid leading/trailing dots or underscores; trim length
-    name = name.strip("._") or "file"
-    return name[:64]
-
-
-# ============================================================
-# 🧠 LOGGING & DIAGNOSTIC HELPERS
-# ============================================================
-def utc_now_iso() -> str:
-    """Return current UTC timestamp in ISO-8601 format."""
-    return datetime.utcnow().isoformat()
-
-
-def log_event(event: str, meta: Optional[Dict[str, Any]] = None) -> None:
-    """
-    Append a JSON line to the global event log and print to console.
-    Used by all backend modules for analytics and dashboard.
-
-    Accepts:
-      • event: short event string
-      • meta : optional dict payload (anything JSON-serializable; non-serializable values coerced to str)
-    """
-    record = {
-        "timestamp": utc_now_iso(),
-        "event": str(event),
-        "meta": meta or {},
-    }
-
-    # Console log (truncate very large metas for readability)
-    try:
-        preview = json.dumps(record["meta"], ensure_ascii=False)
-        if len(preview) > 800:
-            preview = preview[:800] + "…"
-        print(f"[{record['timestamp']}] {record['event']} :: {preview}")
-    except Exception:
-        print(f"[{record['timestamp']}] {record['event']} :: (unserializable meta)")
-
-    # Persistent log (append JSONL)
-    try:
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
-    except Exception as e:
-        print(f"[HIREX] ⚠️ Failed to write event log: {e}")
-
-
-def benchmark(name: str):
-    """
-    Context manager for timing code blocks.
-
-    Example:
-        with benchmark("Optimize Resume"):
-            run_some_code()
-    """
-    import time
-
-    class _Timer:
-        def __enter__(self):
-            self._start = time.time()
-            return self
-
-        def __exit__(self, exc_type, exc_val, exc_tb):
-            duration_ms = (time.time() - self._start) * 1000.0
-            log_event("⏱️ benchmark", {"name": name, "duration_ms": round(duration_ms, 1)})
-
-    return _Timer()
-
-
-# ============================================================
-# 🧪 Local Test
-# ============================================================
-if __name__ == "__main__":
-    sample = r"""
-    \documentclass{article}
-    \begin{document}
-    Hello \textbf{World!} $E = mc^2$
-    \end{document}
-    """
-    print("Original LaTeX (unchanged):")
-    print(sample)
-    print("SHA256:", sha256_str(sample))
-    print("Short Hash:", simple_hash(sample))
-    print("Safe File:", safe_filename("My Resume (final).tex"))
-
-    with benchmark("Hash Generation"):
-        for _ in range(10000):
-            sha256_str(sample)
+"""
+HIREX • core/utils.py (v2.0.0)
+Common utility functions shared across backend modules.
+For this version: No LaTeX escaping or text cleaning — passes LaTeX as-is.
+Author: Sri Akash Kadali
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import re
+import html
+import hashlib
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+
+# ============================================================
+# 📁 Logging path (honor config if available)
+# ============================================================
+try:
+    from backend.core import config as _cfg  # type: ignore
+    _DEFAULT_LOG_PATH = Path(getattr(_cfg, "LOG_PATH", "backend/data/logs/events.jsonl"))
+except Exception:
+    _DEFAULT_LOG_PATH = Path("backend/data/logs/events.jsonl")
+
+LOG_PATH = _DEFAULT_LOG_PATH
+LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+
+# ============================================================
+# 🔐 HASHING UTILITIES
+# ============================================================
+def _content_hash(data: Optional[str], algo: str = "blake2b") -> str:
+    """
+    Hash a string for cache keys / content IDs. Defaults to BLAKE2b,
+    which is several times faster than SHA-256 without SHA-NI; pass
+    algo="sha256" where cryptographic strength actually matters.
+    """
+    raw = (data or "").encode("utf-8")
+    if algo == "sha256":
+        return hashlib.sha256(raw).hexdigest()
+    return hashlib.blake2b(raw, digest_size=32).hexdigest()
+
+
+def sha256_str(data: Optional[str]) -> str:
+    """Generate a full SHA256 hash of a string."""
+    return _content_hash(data, algo="sha256")
+
+
+def simple_hash(data: Optional[str], length: int = 8) -> str:
+    """Generate a short deterministic hash (used for cache keys or content IDs)."""
+    return _content_hash(data)[:max(1, int(length))]
+
+
+# ============================================================
+# 📜 TEXT HELPERS (NO LATEX ESCAPING)
+# ============================================================
+def tex_escape(text: Optional[str]) -> str:
+    """
+    Passthrough for LaTeX text (no escaping).
+    Used when sending LaTeX to or receiving from OpenAI/Humanize.
+    """
+    return text or ""
+
+
+def html_escape(text: Optional[str]) -> str:
+    """HTML-escape text for safe display inside web UIs (not LaTeX)."""
+    return html.escape(text or "")
+
+
+def clean_text(text: Optional[str]) -> str:
+    """
+    Lightweight text cleaner (no normalization, no space compression).
+    Keeps LaTeX intact.
+    """
+    if not text:
+        return ""
+    return str(text)
+
+
+# safe_filename runs on every upload/context/save path: the pattern is
+# compiled once, and ASCII input (the common case) takes a single
+# translate pass instead of the regex engine.
+_SAFE_FN_RE = re.compile(r"[^A-Za-z0-9_.-]")
+_SAFE_FN_TABLE = str.maketrans(
+    {chr(c): ("_" if _SAFE_FN_RE.match(chr(c)) else chr(c)) for c in range(128)}
+)
+
+
+def safe_filename(name: Optional[str]) -> str:
+    """Convert a string into a safe, cross-platform filename."""
+    if not name:
+        return "file"
+    if name.isascii():
+        name = name.translate(_SAFE_FN_TABLE)
+    else:
+        name = _SAFE_FN_RE.sub("_", name)
+    # Avoid leading/trailing dots or underscores; trim length
+    name = name.strip("._") or "file"
+    return name[:64]
+
+
+# ============================================================
+# 📄 FILE TAIL HELPERS
+# ============================================================
+def tail_lines(path: Path, n: int, block: int = 65536) -> list:
+    """
+    Read only the last N lines of a file by scanning blocks backwards
+    from EOF — avoids loading a multi-MB log just to slice its tail.
+    Lines stay bytes so json/orjson can parse them without a decode step.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        buf = b""
+        while pos > 0 and buf.count(b"\n") <= n:
+            read = min(block, pos)
+            pos -= read
+            f.seek(pos)
+            buf = f.read(read) + buf
+    lines = [ln for ln in buf.split(b"\n") if ln]
+    return lines[-n:]
+
+
+# ============================================================
+# 🧠 LOGGING & DIAGNOSTIC HELPERS
+# ============================================================
+# Timestamp formatting is called for every log event and health poll;
+# at 100 ms granularity one formatted string serves many calls. Lazy
+# refresh (no background task) so it works in sync code too. Races just
+# format the same value twice — harmless.
+_NOW_CACHE: Dict[str, Any] = {"at": 0.0, "iso": ""}
+_NOW_RESOLUTION_S = 0.1
+
+
+def utc_now_iso() -> str:
+    """Return current UTC timestamp in ISO-8601 format (100 ms granularity)."""
+    now = time.monotonic()
+    if now - _NOW_CACHE["at"] >= _NOW_RESOLUTION_S:
+        _NOW_CACHE["iso"] = datetime.utcnow().isoformat()
+        _NOW_CACHE["at"] = now
+    return _NOW_CACHE["iso"]
+
+
+# ------------------------------------------------------------
+# Batched persistent writer: log_event runs on hot request paths, so
+# instead of an open/append/close per event, lines are queued and a
+# daemon thread flushes them in batches (up to _FLUSH_BATCH lines or
+# _FLUSH_INTERVAL_S of quiet) — one write syscall per batch. A thread
+# (not an asyncio task) so logging works from sync code and at import
+# time, before any event loop exists.
+# ------------------------------------------------------------
+# Console output goes through a logging QueueHandler → QueueListener
+# pair: the request path only enqueues the record, and a listener thread
+# does the (blocking, contended) stream write. Also gives callers normal
+# log-level filtering on the "hirex" logger for free.
+_console_logger = logging.getLogger("hirex")
+_console_logger.setLevel(logging.INFO)
+_console_logger.propagate = False
+if not _console_logger.handlers:
+    _console_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+    _console_logger.addHandler(QueueHandler(_console_queue))
+    _console_listener = QueueListener(_console_queue, logging.StreamHandler())
+    _console_listener.start()
+    atexit.register(_console_listener.stop)
+
+# Queue items are the persisted JSONL lines; console records travel
+# separately via the logging queue above.
+_LOG_QUEUE: "queue.Queue[str]" = queue.Queue(maxsize=10_000)
+_FLUSH_BATCH = 32
+_FLUSH_INTERVAL_S = 0.05
+_dropped_events = 0
+
+
+# Persistent line count sidecar: /status needs "how many events total"
+# without re-reading the whole JSONL. The sidecar holds "count size" —
+# the log size the count was taken at — and the count is derived from
+# the shared log itself: any bytes past the recorded size are folded by
+# counting their newlines, and a log smaller than the recorded size
+# (rotation/truncation) triggers a full recount. Deriving from the file
+# rather than a per-process "+= n" keeps the number right under
+# gunicorn, where several workers append to the same O_APPEND log but
+# each has its own copy of this module's state.
+_COUNT_PATH = LOG_PATH.with_name("events.count")
+_count_lock = threading.Lock()
+_line_count: Optional[int] = None
+_counted_size: int = 0
+
+
+def _recount() -> int:
+    """Rebuild by counting newlines in megabyte chunks."""
+    global _counted_size
+    try:
+        with open(LOG_PATH, "rb") as f:
+            count = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+            _counted_size = f.tell()
+    except OSError:
+        count, _counted_size = 0, 0
+    return count
+
+
+def _load_line_count() -> int:
+    global _line_count, _counted_size
+    if _line_count is None:
+        try:
+            parts = _COUNT_PATH.read_text().split()
+            _line_count = int(parts[0]) if parts else 0
+            # Legacy sidecars carried only the count; force a verify pass
+            _counted_size = int(parts[1]) if len(parts) > 1 else -1
+        except Exception:
+            _line_count = _recount()
+    try:
+        size = LOG_PATH.stat().st_size
+    except OSError:
+        size = 0
+    if size < _counted_size or _counted_size < 0:
+        # Log shrank (rotation/truncation) — the sidecar count is stale
+        _line_count = _recount()
+    elif size > _counted_size:
+        # Fold only the appended delta — ours or another worker's
+        try:
+            with open(LOG_PATH, "rb") as f:
+                f.seek(_counted_size)
+                _line_count += sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+                _counted_size = f.tell()
+        except OSError:
+            _line_count = _recount()
+    return _line_count
+
+
+def event_line_count() -> int:
+    """Total lines ever appended to the event log (O(1) after warmup)."""
+    with _count_lock:
+        return _load_line_count()
+
+
+def _sync_line_count() -> None:
+    """Fold newly appended log bytes and persist the sidecar pair."""
+    with _count_lock:
+        count = _load_line_count()
+        # Temp-and-replace so concurrent workers can't interleave a torn
+        # sidecar; count and size land as one consistent pair, and a
+        # pair that is behind the log self-heals via the delta fold.
+        try:
+            tmp = _COUNT_PATH.with_name(f"{_COUNT_PATH.name}.{os.getpid()}.tmp")
+            tmp.write_text(f"{count} {_counted_size}")
+            os.replace(tmp, _COUNT_PATH)
+        except Exception:
+            pass
+
+
+# One long-lived O_APPEND descriptor instead of an open/close pair per
+# flush: the kernel serializes appends, so this stays correct even if
+# multiple worker processes ever share the file.
+_LOG_FD: Optional[int] = None
+
+
+def _get_log_fd() -> int:
+    global _LOG_FD
+    if _LOG_FD is None:
+        _LOG_FD = os.open(str(LOG_PATH), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    return _LOG_FD
+
+
+def _close_log_fd() -> None:
+    global _LOG_FD
+    if _LOG_FD is not None:
+        try:
+            os.close(_LOG_FD)
+        except OSError:
+            pass
+        _LOG_FD = None
+
+
+atexit.register(_close_log_fd)
+
+
+def _write_lines(batch) -> None:
+    try:
+        data = "".join(batch).encode("utf-8")
+        fd = _get_log_fd()
+        while data:
+            try:
+                written = os.write(fd, data)
+            except InterruptedError:
+                continue
+            data = data[written:]
+        _sync_line_count()
+    except Exception as e:
+        _console_logger.warning("[HIREX] ⚠️ Failed to write event log: %s", e)
+
+
+def _flush_loop() -> None:
+    while True:
+        batch = [_LOG_QUEUE.get()]
+        deadline = time.monotonic() + _FLUSH_INTERVAL_S
+        while len(batch) < _FLUSH_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_LOG_QUEUE.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _write_lines(batch)
+
+
+threading.Thread(target=_flush_loop, daemon=True, name="hirex-log-flusher").start()
+
+
+def _drain_log_queue() -> None:
+    """Flush anything still queued when the interpreter exits."""
+    lines = []
+    while True:
+        try:
+            lines.append(_LOG_QUEUE.get_nowait())
+        except queue.Empty:
+            break
+    if lines:
+        _write_lines(lines)
+
+
+atexit.register(_drain_log_queue)
+
+
+def log_event(event: str, meta: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Append a JSON line to the global event log and print to console.
+    Used by all backend modules for analytics and dashboard.
+
+    Accepts:
+      • event: short event string
+      • meta : optional dict payload (anything JSON-serializable; non-serializable values coerced to str)
+    """
+    global _dropped_events
+    record = {
+        "timestamp": utc_now_iso(),
+        "event": str(event),
+        "meta": meta or {},
+    }
+
+    # Console preview (truncate very large metas for readability);
+    # emitted via the queue-backed "hirex" logger, so the stream write
+    # happens on the listener thread, not here
+    try:
+        preview = orjson.dumps(record["meta"], default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        if len(preview) > 800:
+            preview = preview[:800] + "…"
+        _console_logger.info("[%s] %s :: %s", record["timestamp"], record["event"], preview)
+    except Exception:
+        _console_logger.info("[%s] %s :: (unserializable meta)", record["timestamp"], record["event"])
+
+    # Persistent log (queued; flushed in batches by the writer thread).
+    # Drop-on-full rather than blocking a request on a stuck disk.
+    try:
+        line = orjson.dumps(record, default=str, option=orjson.OPT_NON_STR_KEYS).decode() + "\n"
+        _LOG_QUEUE.put_nowait(line)
+    except queue.Full:
+        _dropped_events += 1
+    except Exception as e:
+        _console_logger.warning("[HIREX] ⚠️ Failed to queue event log: %s", e)
+
+
+# perf_counter_ns is monotonic (immune to NTP jumps) and keeps the
+# arithmetic in integers; __slots__ skips the per-instance __dict__ for
+# tight benchmark loops.
+class _Timer:
+    __slots__ = ("_start", "_name")
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration_us = (time.perf_counter_ns() - self._start) // 1000
+        log_event("⏱️ benchmark", {"name": self._name, "duration_us": duration_us})
+
+
+def benchmark(name: str):
+    """
+    Context manager for timing code blocks.
+
+    Example:
+        with benchmark("Optimize Resume"):
+            run_some_code()
+    """
+    return _Timer(name)
+
+
+# ============================================================
+# 🧪 Local Test
+# ============================================================
+if __name__ == "__main__":
+    sample = r"""
+    \documentclass{article}
+    \begin{document}
+    Hello \textbf{World!} $E = mc^2$
+    \end{document}
+    """
+    print("Original LaTeX (unchanged):")
+    print(sample)
+    print("SHA256:", sha256_str(sample))
+    print("Short Hash:", simple_hash(sample))
+    print("Safe File:", safe_filename("My Resume (final).tex"))
+
+    with benchmark("Hash Generation"):
+        for _ in range(10000):
+            sha256_str(sample)
@@ -1,309 +1,667 @@
-"""
-============================================================
- HIREX v2.0.0— main.py (Windows App Version)
- ------------------------------------------------------------
- Launches FastAPI backend + HTML/JS UI inside a native
- Windows window via PyWebview.
-
- Features:
-   • Graceful startup with backend health polling
-   • Built-in close (✖) button that exits cleanly
-   • Auto router discovery (with import fallbacks) + logging
-   • Developer-friendly CORS + tracing middleware
-   • Cross-platform fallback (CLI-only mode)
-
- Author: Sri Akash Kadali
-============================================================
-"""
-
-# ============================================================
-# 🧭 Path Setup
-# ============================================================
-import os
-import sys
-import time
-import signal
-import threading
-import importlib
-from typing import Optional, Dict
-
-CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = os.path.dirname(CURRENT_DIR)
-
-for p in (ROOT_DIR, CURRENT_DIR, os.path.join(ROOT_DIR, "backend")):
-    if p not in sys.path:
-        sys.path.append(p)
-
-
-# ============================================================
-# 🪵 Logging Helper
-# ============================================================
-def _fallback_log(msg: str):
-    ts = time.strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{ts}] {msg}")
-
-try:
-    from backend.core.utils import log_event  # type: ignore
-except Exception:
-    log_event = _fallback_log
-
-
-# ============================================================
-# 🌐 FastAPI Backend
-# ============================================================
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
-
-APP_VERSION = "2.0.0"
-
-app = FastAPI(
-    title="HIREX API",
-    description="High Resume eXpert — AI-powered Resume, Cover Letter, and Assistant",
-    version=APP_VERSION,
-)
-
-# ------------------------------------------------------------
-# 🔄 Router Auto-Import (tries backend.api.<name> then api.<name>)
-# ------------------------------------------------------------
-def _safe_import(module: str):
-    for mod_path in (f"backend.api.{module}", f"api.{module}"):
-        try:
-            mod = importlib.import_module(mod_path)
-            if hasattr(mod, "router"):
-                log_event(f"🧩 Router loaded: {mod_path}")
-                return mod
-        except Exception:
-            continue
-    log_event(f"⚠️ Router load failed: {module}")
-    return None
-
-
-ROUTER_NAMES = [
-    # core flows
-    "optimize",
-    "coverletter",
-    "talk",
-    "superhuman",
-    "humanize",       # AIHumanize or related endpoints
-    "mastermind",
-    # system & UI data
-    "dashboard",
-    "models_router",  # models + pricing catalog
-    "context_store",  # JD+Resume memory
-    # misc
-    "utils_router",
-    "debug",
-]
-ROUTERS: Dict[str, object] = {name: _safe_import(name) for name in ROUTER_NAMES}
-
-# ============================================================
-# 🛰 Middleware — Request/Response Logger
-# ============================================================
-@app.middleware("http")
-async def trace_requests(request: Request, call_next):
-    start = time.time()
-    path = request.url.path
-    method = request.method
-    log_event(f"➡️ {method} {path}")
-    try:
-        response = await call_next(request)
-        ms = (time.time() - start) * 1000
-        log_event(f"⬅️ {method} {path} → {response.status_code} ({ms:.1f} ms)")
-        # Add simple cache headers for static assets
-        if path.startswith("/static/"):
-            response.headers["Cache-Control"] = "public, max-age=604800"  # 7 days
-        return response
-    except Exception as e:
-        log_event(f"💥 Middleware error on {path}: {e}")
-        return JSONResponse({"error": "internal_middleware_error", "detail": str(e)}, status_code=500)
-
-
-# ============================================================
-# 🔓 CORS (Frontend Access)
-# ============================================================
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# ============================================================
-# 🧩 Static + Frontend Mount
-# ============================================================
-FRONTEND_DIR = os.path.normpath(os.path.join(ROOT_DIR, "frontend"))
-STATIC_DIR = os.path.join(FRONTEND_DIR, "static")
-
-if os.path.exists(STATIC_DIR):
-    app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
-    log_event(f"📦 Static mounted → {STATIC_DIR}")
-else:
-    log_event(f"⚠️ Static folder missing: {STATIC_DIR}")
-
-def _frontend_path(filename: str) -> Optional[str]:
-    path = os.path.join(FRONTEND_DIR, filename)
-    return path if os.path.exists(path) else None
-
-@app.get("/", include_in_schema=False)
-def serve_index():
-    # Prefer master.html (single-file UI), fall back to index.html
-    for fname in ("master.html", "index.html"):
-        f = _frontend_path(fname)
-        if f:
-            return FileResponse(f)
-    # Optional fallback to /mnt/data/master.html when developing
-    alt = os.path.normpath("/mnt/data/master.html")
-    if os.path.exists(alt):
-        return FileResponse(alt)
-    return JSONResponse({"error": "frontend_not_found"}, status_code=404)
-
-@app.get("/{page_name}", include_in_schema=False)
-def serve_page(page_name: str):
-    # Allow /master -> master.html, also *.html direct hits
-    if page_name == "master":
-        f = _frontend_path("master.html")
-        return FileResponse(f) if f else RedirectResponse("/")
-    page = page_name if page_name.endswith(".html") else f"{page_name}.html"
-    f = _frontend_path(page)
-    return FileResponse(f) if f else RedirectResponse("/")
-
-
-# ============================================================
-# 🔗 Router Registration
-# ============================================================
-for name, mod in ROUTERS.items():
-    if mod and hasattr(mod, "router"):
-        app.include_router(mod.router)
-    else:
-        log_event(f"ℹ️ Skipping router: {name}")
-
-@app.get("/health", tags=["System"])
-def health():
-    return {"status": "ok", "version": APP_VERSION, "time": time.strftime("%H:%M:%S")}
-
-
-# ============================================================
-# 🪟 Windows GUI (PyWebview)
-# ============================================================
-def start_fastapi():
-    import uvicorn
-    host = os.getenv("HIREX_HOST", "127.0.0.1")
-    port = int(os.getenv("HIREX_PORT", "8000"))
-    # Disable uvicorn reload inside packaged app to avoid double-imports
-    uvicorn.run(app, host=host, port=port, log_level="error", timeout_keep_alive=25, reload=False)
-
-def _wait_for_backend(url: str, timeout_s: float = 15.0) -> bool:
-    import urllib.request, json
-    start = time.time()
-    health_url = f"{url.rstrip('/')}/health"
-    while time.time() - start < timeout_s:
-        try:
-            with urllib.request.urlopen(health_url, timeout=1.5) as resp:
-                ok = resp.status == 200
-                if ok:
-                    data = json.loads(resp.read() or b"{}")
-                    if data.get("status") == "ok":
-                        return True
-        except Exception:
-            time.sleep(0.35)
-    return False
-
-def start_window():
-    # Allow disabling WebView via env (useful for servers/WSL)
-    if os.getenv("HIREX_NO_GUI", "0") == "1":
-        log_event("ℹ️ HIREX_NO_GUI set — running backend only (no webview).")
-        return start_fastapi()
-
-    try:
-        import webview
-    except Exception as e:
-        log_event(f"⚠️ PyWebview unavailable ({e}) — starting backend only.")
-        return start_fastapi()
-
-    base_host = os.getenv("HIREX_HOST", "127.0.0.1")
-    base_port = int(os.getenv("HIREX_PORT", "8000"))
-    base_url = f"http://{base_host}:{base_port}"
-
-    # Start backend first (in case user runs this entrypoint directly)
-    if not _wait_for_backend(base_url, 2.0):
-        threading.Thread(target=start_fastapi, daemon=True).start()
-
-    # Give it a moment to come up
-    _wait_for_backend(base_url, 20)
-
-    class Bridge:
-        def close_app(self):
-            log_event("🛑 Close button pressed — shutting down HIREX.")
-            try:
-                os.kill(os.getpid(), signal.SIGTERM)
-            except Exception:
-                os._exit(0)
-
-    window = webview.create_window(
-        title=f"HIREX v{APP_VERSION} — Intelligent Career Suite",
-        url=base_url,
-        width=1280,
-        height=820,
-        resizable=True,
-        background_color="#0a1020",
-        js_api=Bridge(),
-    )
-
-    def inject_close_button():
-        js = """
-        (function(){
-          if(window.__hirexClose)return;
-          window.__hirexClose=true;
-          const btn=document.createElement('button');
-          btn.textContent='✖';
-          Object.assign(btn.style,{
-            position:'fixed',top:'12px',right:'16px',zIndex:'9999',
-            padding:'6px 10px',border:'none',borderRadius:'6px',
-            background:'#e74c3c',color:'#fff',fontSize:'15px',
-            cursor:'pointer',transition:'transform .2s ease'
-          });
-          btn.onmouseenter=()=>btn.style.transform='scale(1.08)';
-          btn.onmouseleave=()=>btn.style.transform='scale(1)';
-          btn.onclick=()=>window.pywebview?.api?.close_app();
-          document.body.appendChild(btn);
-        })();
-        """
-        try:
-            window.evaluate_js(js)
-        except Exception as e:
-            log_event(f"⚠️ JS injection failed: {e}")
-
-    try:
-        # Prefer Edge (Chromium) engine on Windows if available
-        webview.start(func=inject_close_button, gui="edgechromium", debug=False)
-    except Exception:
-        webview.start(func=inject_close_button, debug=False)
-
-
-# ============================================================
-# 🚀 Entry Point
-# ============================================================
-if __name__ == "__main__":
-    print(f"🚀 Launching HIREX v{APP_VERSION} — Windows App Mode")
-    host = os.getenv("HIREX_HOST", "127.0.0.1")
-    port = os.getenv("HIREX_PORT", "8000")
-    print(f"🟢 Backend → http://{host}:{port}\n")
-
-    def _graceful_exit(signum, _):
-        print("\n🛑 Exiting HIREX…")
-        os._exit(0)
-
-    # Register signals if available (Windows supports SIGINT; SIGTERM may be present)
-    for sig in ("SIGINT", "SIGTERM"):
-        if hasattr(signal, sig):
-            signal.signal(getattr(signal, sig), _graceful_exit)
-
-    try:
-        start_window()
-    except Exception as e:
-        log_event(f"⚠️ GUI fallback — {e}")
-        print(f"Running backend only. Visit http://{host}:{port}")
-        start_fastapi()
+"""
+============================================================
+ HIREX v2.0.0— main.py (Windows App Version)
+ ------------------------------------------------------------
+ Launches FastAPI backend + HTML/JS UI inside a native
+ Windows window via PyWebview.
+
+ Features:
+   • Graceful startup with backend health polling
+   • Built-in close (✖) button that exits cleanly
+   • Auto router discovery (with import fallbacks) + logging
+   • Developer-friendly CORS + tracing middleware
+   • Cross-platform fallback (CLI-only mode)
+
+ Author: Sri Akash Kadali
+============================================================
+"""
+
+# ============================================================
+# 🧭 Path Setup
+# ============================================================
+import asyncio
+import os
+import re
+import sys
+import time
+import threading
+import importlib
+from typing import Optional, Dict
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(CURRENT_DIR)
+
+for p in (ROOT_DIR, CURRENT_DIR, os.path.join(ROOT_DIR, "backend")):
+    if p not in sys.path:
+        sys.path.append(p)
+
+
+# ============================================================
+# 🪵 Logging Helper
+# ============================================================
+# strftime once per second, not per message — the fallback logger can
+# sit on the hot request path when core.utils is unavailable
+_FB_TS = [0, ""]
+
+
+def _fallback_log(msg: str):
+    now = int(time.time())
+    if now != _FB_TS[0]:
+        _FB_TS[0] = now
+        _FB_TS[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+    # One stderr write, no print() keyword plumbing or stdout lock
+    sys.stderr.write(f"[{_FB_TS[1]}] {msg}\n")
+
+try:
+    from backend.core.utils import log_event  # type: ignore
+except Exception:
+    log_event = _fallback_log
+
+
+# ============================================================
+# 🌐 FastAPI Backend
+# ============================================================
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, RedirectResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import MutableHeaders
+
+APP_VERSION = "2.0.0"
+
+app = FastAPI(
+    title="HIREX API",
+    description="High Resume eXpert — AI-powered Resume, Cover Letter, and Assistant",
+    version=APP_VERSION,
+    # orjson serializes in C and returns bytes directly — no separate
+    # encode step per response
+    default_response_class=ORJSONResponse,
+)
+
+# ------------------------------------------------------------
+# 🔄 Router Auto-Import (tries backend.api.<name> then api.<name>)
+# ------------------------------------------------------------
+def _safe_import(module: str):
+    for mod_path in (f"backend.api.{module}", f"api.{module}"):
+        try:
+            mod = importlib.import_module(mod_path)
+            if hasattr(mod, "router"):
+                log_event(f"🧩 Router loaded: {mod_path}")
+                return mod
+        except Exception:
+            continue
+    log_event(f"⚠️ Router load failed: {module}")
+    return None
+
+
+# Ordered hottest-first: Starlette scans the route list linearly, so
+# the polling endpoints (dashboard sidebar, utils status/history) and
+# the main interactive flows should match before the long tail.
+ROUTER_NAMES = [
+    # high-frequency polling
+    "dashboard",
+    "utils_router",
+    # core flows
+    "talk",
+    "optimize",
+    "coverletter",
+    "superhuman",
+    "humanize",       # AIHumanize or related endpoints
+    "mastermind",
+    # system & UI data
+    "models_router",  # models + pricing catalog
+    "context_store",  # JD+Resume memory
+    # misc
+    "debug",
+]
+# Router modules drag in the whole model/pricing/context dependency
+# graph; loading them on a background thread lets the port bind and the
+# webview open while imports finish. The tracing middleware holds any
+# early /api request until the table is complete. HIREX_EAGER_ROUTERS=1
+# restores synchronous loading (deterministic startup for debugging).
+ROUTERS: Dict[str, object] = {}
+_ROUTERS_READY = threading.Event()
+
+
+def _load_routers() -> None:
+    # One pkgutil scan enumerates backend.api up front, so each present
+    # router is a single import with no two-path try/except probing.
+    # The api.<name> fallback only matters for flat dev layouts — gate
+    # it behind HIREX_DEV=1 instead of paying it in packaged builds.
+    try:
+        import pkgutil
+        import backend.api as _api_pkg
+        available = {m.name for m in pkgutil.iter_modules(_api_pkg.__path__)}
+    except Exception:
+        available = set()
+    dev_mode = os.getenv("HIREX_DEV", "0") == "1"
+
+    loaded, skipped = [], []
+    for name in ROUTER_NAMES:
+        mod = None
+        if name in available:
+            try:
+                mod = importlib.import_module(f"backend.api.{name}")
+            except Exception:
+                mod = None
+        if mod is None and dev_mode:
+            mod = _safe_import(name)
+        ROUTERS[name] = mod
+        if mod and hasattr(mod, "router"):
+            app.include_router(mod.router)
+            loaded.append(name)
+        else:
+            skipped.append(name)
+
+    summary = f"🧩 Routers loaded: {', '.join(loaded) or 'none'}"
+    if skipped:
+        summary += f" — skipped: {', '.join(skipped)}"
+    log_event(summary)
+    _ROUTERS_READY.set()
+
+# ============================================================
+# 🛰 Middleware — Request/Response Logger
+# ============================================================
+class TraceRequestsMiddleware:
+    """
+    Pure-ASGI port of the request logger. The decorator form runs
+    through BaseHTTPMiddleware, which spawns a task plus a pair of
+    anyio streams for every request just to offer call_next; working
+    on the scope directly keeps the hot path allocation-free.
+    (Starlette already builds and memoizes the middleware stack once
+    at startup — nothing to cache on our side.)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"]
+
+        # No-op traffic (health polls, favicon probes) skips timing and
+        # logging entirely — a page load fires dozens of these
+        if path.startswith(("/health", "/favicon")):
+            return await self.app(scope, receive, send)
+
+        is_static = path.startswith("/static/")
+        if not is_static:
+            method = scope["method"]
+            start_ns = time.monotonic_ns()
+            log_event(f"➡️ {method} {path}")
+
+        # Hold early API calls until background router loading finishes
+        if not _ROUTERS_READY.is_set() and path.startswith("/api/"):
+            await asyncio.to_thread(_ROUTERS_READY.wait, 30.0)
+
+        etag = _STATIC_ETAG.get(path) if is_static else None
+        if etag is not None:
+            # Conditional static hit: answer 304 from the cached tag
+            # before the request ever reaches the static app
+            etag_b = etag.encode("latin-1")
+            for name, value in scope["headers"]:
+                if name == b"if-none-match" and value == etag_b:
+                    return await Response(status_code=304, headers={"ETag": etag})(
+                        scope, receive, send
+                    )
+
+        status_code: Optional[int] = None
+
+        async def _send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if is_static:
+                    # Content-hashed names never change; everything else
+                    # gets the 7-day cache
+                    headers = MutableHeaders(scope=message)
+                    if _HASHED_ASSET_RE.search(path):
+                        headers["Cache-Control"] = "public, max-age=31536000, immutable"
+                    else:
+                        headers["Cache-Control"] = "public, max-age=604800"  # 7 days
+                    if etag is not None:
+                        headers["ETag"] = etag
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+            if not is_static:
+                # Integer µs from the monotonic clock: immune to NTP
+                # jumps and cheaper to format than a float
+                dur_us = (time.monotonic_ns() - start_ns) // 1000
+                log_event(f"⬅️ {method} {path} → {status_code} ({dur_us}µs)")
+        except Exception as e:
+            log_event(f"💥 Middleware error on {path}: {e}")
+            if status_code is None:
+                response = ORJSONResponse(
+                    {"error": "internal_middleware_error", "detail": str(e)}, status_code=500
+                )
+                await response(scope, receive, send)
+
+
+app.add_middleware(TraceRequestsMiddleware)
+
+
+# ============================================================
+# 🔓 CORS (Frontend Access)
+# ============================================================
+# Added after the tracer, so CORS is the outermost layer and browser
+# preflights short-circuit here without paying the logging path.
+# Explicit origins via HIREX_ALLOWED_ORIGINS (comma-separated) enable
+# credentials and let Starlette emit a static allow-origin header; the
+# wildcard default keeps the permissive dev behavior but drops the
+# credentials flag — "*" + credentials forces the slower per-request
+# origin-echo path and is rejected by browsers anyway.
+#
+# In packaged webview mode (run as a script, GUI on) the UI is served
+# from the backend's own origin, so CORS is dead weight on every
+# request — skip the middleware entirely there. HIREX_ENABLE_CORS
+# overrides the default either way.
+_CORS_DEFAULT = "0" if (__name__ == "__main__" and os.getenv("HIREX_NO_GUI", "0") != "1") else "1"
+if os.getenv("HIREX_ENABLE_CORS", _CORS_DEFAULT) == "1":
+    _ALLOWED_ORIGINS = [o.strip() for o in os.getenv("HIREX_ALLOWED_ORIGINS", "").split(",") if o.strip()]
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=_ALLOWED_ORIGINS or ["*"],
+        allow_credentials=bool(_ALLOWED_ORIGINS),
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+# ============================================================
+# 🧩 Static + Frontend Mount
+# ============================================================
+FRONTEND_DIR = os.path.normpath(os.path.join(ROOT_DIR, "frontend"))
+STATIC_DIR = os.path.join(FRONTEND_DIR, "static")
+
+# Static assets don't change while the app runs (packaged build), so
+# stat everything once: serving skips the per-request stat, and the
+# middleware can answer conditional requests with a 304 from the cached
+# inode+mtime tag without entering the static app at all.
+_STATIC_LOOKUP: Dict[str, tuple] = {}   # StaticFiles-relative path → (full, stat)
+_STATIC_ETAG: Dict[str, str] = {}       # URL path → ETag
+# Content-hashed filenames (e.g. app.3f9a1c2d.js) can be cached forever
+_HASHED_ASSET_RE = re.compile(r"\.[0-9a-f]{8,}\.(?:js|css|png|woff2)$")
+
+
+def _scan_static(dir_path: str = "", prefix: str = "") -> None:
+    # Recursive scandir instead of walk + os.stat: DirEntry.stat() is
+    # served from the directory read on most filesystems, so each asset
+    # costs one syscall batch instead of a separate stat.
+    try:
+        entries = os.scandir(dir_path or STATIC_DIR)
+    except OSError:
+        return
+    with entries:
+        for e in entries:
+            if e.is_dir(follow_symlinks=False):
+                _scan_static(e.path, f"{prefix}{e.name}/")
+            elif e.is_file(follow_symlinks=False):
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                rel = f"{prefix}{e.name}"
+                _STATIC_LOOKUP[rel] = (e.path, st)
+                _STATIC_ETAG[f"/static/{rel}"] = f'"{st.st_ino:x}-{st.st_mtime_ns:x}"'
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that resolves known paths from the startup stat cache."""
+
+    def lookup_path(self, path: str):
+        cached = _STATIC_LOOKUP.get(path)
+        return cached if cached is not None else super().lookup_path(path)
+
+
+# Snapshot the frontend directory in one scandir pass: the filename set
+# (so unknown-page probes resolve with a set lookup, not a stat syscall
+# on the event loop thread) and whether static/ exists come from the
+# same directory read. HIREX_FRONTEND_RESCAN=1 rebuilds the set per
+# request for dev, where files appear while the app runs.
+def _scan_frontend() -> tuple:
+    files, has_static = set(), False
+    try:
+        with os.scandir(FRONTEND_DIR) as it:
+            for e in it:
+                files.add(e.name)
+                if e.name == "static" and e.is_dir(follow_symlinks=False):
+                    has_static = True
+    except OSError:
+        pass
+    return frozenset(files), has_static
+
+
+FRONTEND_FILES, _HAS_STATIC = _scan_frontend()
+_FRONTEND_RESCAN = os.getenv("HIREX_FRONTEND_RESCAN", "0") == "1"
+
+if _HAS_STATIC:
+    _scan_static()
+    app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
+    log_event(f"📦 Static mounted → {STATIC_DIR} ({len(_STATIC_LOOKUP)} files)")
+else:
+    log_event(f"⚠️ Static folder missing: {STATIC_DIR}")
+
+
+def _frontend_path(filename: str) -> Optional[str]:
+    files = _scan_frontend()[0] if _FRONTEND_RESCAN else FRONTEND_FILES
+    if filename in files:
+        return os.path.join(FRONTEND_DIR, filename)
+    return None
+
+@app.get("/", include_in_schema=False)
+def serve_index():
+    # Prefer master.html (single-file UI), fall back to index.html
+    for fname in ("master.html", "index.html"):
+        f = _frontend_path(fname)
+        if f:
+            return FileResponse(f)
+    # Optional fallback to /mnt/data/master.html when developing
+    alt = os.path.normpath("/mnt/data/master.html")
+    if os.path.exists(alt):
+        return FileResponse(alt)
+    return ORJSONResponse({"error": "frontend_not_found"}, status_code=404)
+
+# Route name → absolute file path, both with and without the .html
+# suffix, built once: page dispatch is a dict lookup with no per-request
+# string concat or os.path.join.
+def _build_page_map() -> Dict[str, str]:
+    page_map: Dict[str, str] = {}
+    for fname in FRONTEND_FILES:
+        if fname.endswith(".html"):
+            full = os.path.join(FRONTEND_DIR, fname)
+            page_map[fname[:-5]] = full
+            page_map[fname] = full
+    return page_map
+
+
+PAGE_MAP = _build_page_map()
+
+
+# Explicit routes per frontend page (registered before the catch-all,
+# so known pages dispatch without touching its handler): /talk and
+# /talk.html both serve talk.html with the path bound at startup.
+def _register_page_routes() -> None:
+    for name in sorted(PAGE_MAP):
+        full = PAGE_MAP[name]
+
+        def _serve(path: str = full) -> FileResponse:
+            return FileResponse(path)
+
+        app.add_api_route(f"/{name}", _serve, include_in_schema=False)
+
+
+_register_page_routes()
+
+
+_HEALTH_BASE = {"status": "ok", "version": APP_VERSION}
+_HEALTH_BYTES = orjson.dumps({**_HEALTH_BASE, "time": time.strftime("%H:%M:%S")})
+
+
+async def _refresh_health_bytes() -> None:
+    # Liveness probes fire every few seconds per watcher; serving
+    # prebuilt bytes makes each poll a constant-time memory read, with
+    # the time field refreshed once per second here instead of per hit.
+    global _HEALTH_BYTES
+    while True:
+        _HEALTH_BYTES = orjson.dumps({**_HEALTH_BASE, "time": time.strftime("%H:%M:%S")})
+        await asyncio.sleep(1.0)
+
+
+@app.on_event("startup")
+async def _start_health_refresh():
+    asyncio.create_task(_refresh_health_bytes())
+
+
+@app.on_event("startup")
+async def _size_default_executor():
+    # asyncio's default pool is 32 threads regardless of machine size —
+    # oversubscribed on the small containers this often runs in. Size
+    # it from the cores this process may actually use (sched_getaffinity
+    # respects cgroup/taskset limits; unavailable on Windows/macOS).
+    import concurrent.futures
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    asyncio.get_running_loop().set_default_executor(
+        concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(32, max(1, cores) * 4),
+            thread_name_prefix="hirex",
+        )
+    )
+
+
+@app.get("/health", tags=["System"])
+def health():
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
+
+
+@app.get("/health/ready", tags=["System"])
+def health_ready():
+    """Deep readiness: reports whether background router loading finished."""
+    return {
+        "ready": _ROUTERS_READY.is_set(),
+        "routers": sum(1 for mod in ROUTERS.values() if mod),
+    }
+
+@app.get("/{page_name}", include_in_schema=False)
+def serve_page(page_name: str):
+    # One dict lookup; known pages normally dispatch via the explicit
+    # routes above, so this mostly covers dev rescan mode and typos.
+    # RedirectResponse defaults to 307, which browsers may cache.
+    path = PAGE_MAP.get(page_name)
+    if path is None and _FRONTEND_RESCAN:
+        page_name = page_name.lstrip("/")
+        if ".." in page_name or "/" in page_name:
+            return RedirectResponse("/")
+        page = page_name if page_name.endswith(".html") else f"{page_name}.html"
+        path = _frontend_path(page)
+    return FileResponse(path) if path else RedirectResponse("/")
+
+
+# ============================================================
+# 🔗 Router Registration
+# ============================================================
+if os.getenv("HIREX_EAGER_ROUTERS", "0") == "1":
+    _load_routers()
+else:
+    threading.Thread(target=_load_routers, daemon=True, name="hirex-router-loader").start()
+
+
+
+# ============================================================
+# 🪟 Windows GUI (PyWebview)
+# ============================================================
+def start_fastapi_multi(workers: int):
+    # Linux/macOS server mode: gunicorn forks N UvicornWorker processes,
+    # each with its own event loop, so CPU-bound endpoints scale past a
+    # single GIL. --preload imports backend.main once in the master —
+    # but the background hirex-router-loader thread would not survive
+    # the fork, so the master must load routers eagerly (synchronously,
+    # before forking) or every worker would start with a partial route
+    # table and a _ROUTERS_READY event nobody can ever set.
+    import subprocess
+    host = os.getenv("HIREX_HOST", "127.0.0.1")
+    port = int(os.getenv("HIREX_PORT", "8000"))
+    cmd = [
+        "gunicorn",
+        "backend.main:app",
+        "-k", "uvicorn.workers.UvicornWorker",
+        "-w", str(workers),
+        "--bind", f"{host}:{port}",
+        "--keep-alive", "25",
+        "--preload",
+    ]
+    env = {**os.environ, "HIREX_EAGER_ROUTERS": "1"}
+    log_event(f"🚀 Starting gunicorn with {workers} workers on {host}:{port}")
+    subprocess.run(cmd, env=env)
+
+
+def start_fastapi():
+    workers = int(os.getenv("HIREX_WORKERS", "1"))
+    if workers > 1 and sys.platform != "win32":
+        return start_fastapi_multi(workers)
+
+    import uvicorn
+    host = os.getenv("HIREX_HOST", "127.0.0.1")
+    port = int(os.getenv("HIREX_PORT", "8000"))
+    # Prefer uvloop + httptools (uvicorn[standard]): C event loop and
+    # HTTP parser cut per-request overhead on every endpoint. Fall back
+    # to the pure-Python stack where they aren't installed (Windows has
+    # no uvloop). access_log off — trace_requests already logs requests.
+    opts = dict(
+        host=host,
+        port=port,
+        log_level="error",
+        timeout_keep_alive=25,
+        reload=False,
+        access_log=False,
+    )
+    try:
+        import uvloop  # noqa: F401
+        import httptools  # noqa: F401
+        uvicorn.run(app, loop="uvloop", http="httptools", **opts)
+    except ImportError:
+        uvicorn.run(app, loop="asyncio", http="auto", **opts)
+
+def _wait_for_backend(url: str, timeout_s: float = 15.0) -> bool:
+    # Cheap TCP liveness probe per tick (connect_ex: no HTTP parse, no
+    # exception on refusal); the full /health fetch runs only once the
+    # port accepts. 50 ms ticks suit localhost — HIREX_HEALTH_INTERVAL_MS
+    # lets remote/batch setups lengthen it.
+    import socket
+    import urllib.request, json
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url if "://" in url else f"http://{url}")
+    host = parts.hostname or "127.0.0.1"
+    port = parts.port or 8000
+    interval = max(0.01, int(os.getenv("HIREX_HEALTH_INTERVAL_MS", "50")) / 1000.0)
+    health_url = f"{url.rstrip('/')}/health"
+    deadline = time.monotonic() + timeout_s
+
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            s.settimeout(0.2)
+            if s.connect_ex((host, port)) != 0:
+                time.sleep(interval)
+                continue
+        # Port is open — confirm the app actually answers
+        try:
+            with urllib.request.urlopen(health_url, timeout=1.5) as resp:
+                if resp.status == 200:
+                    data = json.loads(resp.read() or b"{}")
+                    if data.get("status") == "ok":
+                        return True
+        except Exception:
+            pass
+        time.sleep(interval)
+    return False
+
+# Built once at import (pre-minified — whitespace and comments cost IPC
+# bytes on every launch) and bound to the window's loaded event, so the
+# injection fires exactly when the page is ready instead of via the
+# start() polling callback.
+_CLOSE_BUTTON_JS = (
+    "(function(){if(window.__hirexClose)return;window.__hirexClose=true;"
+    "const btn=document.createElement('button');btn.textContent='✖';"
+    "Object.assign(btn.style,{position:'fixed',top:'12px',right:'16px',"
+    "zIndex:'9999',padding:'6px 10px',border:'none',borderRadius:'6px',"
+    "background:'#e74c3c',color:'#fff',fontSize:'15px',cursor:'pointer',"
+    "transition:'transform .2s ease'});"
+    "btn.onmouseenter=()=>btn.style.transform='scale(1.08)';"
+    "btn.onmouseleave=()=>btn.style.transform='scale(1)';"
+    "btn.onclick=()=>window.pywebview?.api?.close_app();"
+    "document.body.appendChild(btn);})();"
+)
+
+
+def start_window():
+    # Allow disabling WebView via env (useful for servers/WSL)
+    if os.getenv("HIREX_NO_GUI", "0") == "1":
+        log_event("ℹ️ HIREX_NO_GUI set — running backend only (no webview).")
+        return start_fastapi()
+
+    try:
+        import webview
+    except Exception as e:
+        log_event(f"⚠️ PyWebview unavailable ({e}) — starting backend only.")
+        return start_fastapi()
+
+    base_host = os.getenv("HIREX_HOST", "127.0.0.1")
+    base_port = int(os.getenv("HIREX_PORT", "8000"))
+    base_url = f"http://{base_host}:{base_port}"
+
+    # Start backend first (in case user runs this entrypoint directly)
+    if not _wait_for_backend(base_url, 2.0):
+        threading.Thread(target=start_fastapi, daemon=True).start()
+
+    # Give it a moment to come up
+    _wait_for_backend(base_url, 20)
+
+    class Bridge:
+        def close_app(self):
+            import signal
+            log_event("🛑 Close button pressed — shutting down HIREX.")
+            try:
+                os.kill(os.getpid(), signal.SIGTERM)
+            except Exception:
+                os._exit(0)
+
+    window = webview.create_window(
+        title=f"HIREX v{APP_VERSION} — Intelligent Career Suite",
+        url=base_url,
+        width=1280,
+        height=820,
+        resizable=True,
+        background_color="#0a1020",
+        js_api=Bridge(),
+    )
+
+    def inject_close_button():
+        try:
+            window.evaluate_js(_CLOSE_BUTTON_JS)
+        except Exception as e:
+            log_event(f"⚠️ JS injection failed: {e}")
+
+    # Fires on each page load (the UI navigates between pages), not just
+    # the first paint
+    window.events.loaded += inject_close_button
+
+    try:
+        # Prefer Edge (Chromium) engine on Windows if available
+        webview.start(gui="edgechromium", debug=False)
+    except Exception:
+        webview.start(debug=False)
+
+
+# ============================================================
+# 🚀 Entry Point
+# ============================================================
+if __name__ == "__main__":
+    import signal
+
+    print(f"🚀 Launching HIREX v{APP_VERSION} — Windows App Mode")
+    host = os.getenv("HIREX_HOST", "127.0.0.1")
+    port = os.getenv("HIREX_PORT", "8000")
+    print(f"🟢 Backend → http://{host}:{port}\n")
+
+    def _graceful_exit(signum, _):
+        print("\n🛑 Exiting HIREX…")
+        os._exit(0)
+
+    # Register signals if available (Windows supports SIGINT; SIGTERM may be present)
+    for sig in ("SIGINT", "SIGTERM"):
+        if hasattr(signal, sig):
+            signal.signal(getattr(signal, sig), _graceful_exit)
+
+    try:
+        start_window()
+    except Exception as e:
+        log_event(f"⚠️ GUI fallback — {e}")
+        print(f"Running backend only. Visit http://{host}:{port}")
+        start_fastapi()